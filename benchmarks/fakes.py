@@ -0,0 +1,230 @@
+"""
+Minimal stand-ins for Red, Config and the discord objects the Timer cog touches.
+
+Nothing here talks to discord, every "request" just returns immediately so the benchmarks
+measure the cog's own overhead.
+"""
+
+import copy
+import itertools
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Any, Dict, Optional
+from unittest import mock
+
+import discord
+
+_ids = itertools.count(1_100_000_000_000_000_000)
+
+
+class FakeValue:
+    def __init__(self, data: Dict[str, Any], key: str):
+        self._data = data
+        self._key = key
+
+    def __getattr__(self, name: str) -> "FakeValue":
+        return FakeValue(self._data[self._key], name)
+
+    async def _get(self):
+        return self._data[self._key]
+
+    def __call__(self):
+        return self._get()
+
+    async def set(self, value):
+        self._data[self._key] = value
+
+    async def clear(self):
+        self._data.pop(self._key, None)
+
+
+class FakeGroup:
+    def __init__(self, data: Dict[str, Any]):
+        self._data = data
+
+    def __getattr__(self, name: str) -> FakeValue:
+        return FakeValue(self._data, name)
+
+
+class FakeConfig:
+    """Just enough of `redbot.core.Config` for the Timer cog, everything is kept in memory."""
+
+    def __init__(self):
+        self._global_defaults: Dict[str, Any] = {}
+        self._guild_defaults: Dict[str, Any] = {}
+        self._globals: Dict[str, Any] = {}
+        self._guilds: Dict[int, Dict[str, Any]] = {}
+
+    @classmethod
+    def get_conf(cls, *args, **kwargs):
+        return cls()
+
+    def register_global(self, **defaults):
+        self._global_defaults.update(defaults)
+        self._globals.update(copy.deepcopy(defaults))
+
+    def register_guild(self, **defaults):
+        self._guild_defaults.update(defaults)
+
+    def __getattr__(self, name: str) -> FakeValue:
+        return FakeValue(self._globals, name)
+
+    def guild_from_id(self, guild_id: int) -> FakeGroup:
+        return FakeGroup(self._guilds.setdefault(guild_id, copy.deepcopy(self._guild_defaults)))
+
+    async def all_guilds(self) -> Dict[int, Dict[str, Any]]:
+        return self._guilds
+
+
+class FakeMessage:
+    def __init__(self, channel: "FakeChannel", message_id: Optional[int] = None):
+        self.id = message_id or next(_ids)
+        self.channel = channel
+
+    async def edit(self, **kwargs):
+        self.channel.requests += 1
+        return self
+
+    async def reply(self, content=None, **kwargs):
+        return await self.channel.send(content, **kwargs)
+
+    def to_reference(self, **kwargs):
+        return None
+
+
+class FakeChannel:
+    def __init__(self, bot: "FakeBot", channel_id: int, guild_id: int):
+        self.bot = bot
+        self.id = channel_id
+        self.guild_id = guild_id
+        self.requests = 0
+
+    async def send(self, content=None, **kwargs):
+        self.requests += 1
+        self.bot.requests += 1
+        return FakeMessage(self)
+
+    def get_partial_message(self, message_id: int) -> FakeMessage:
+        return FakeMessage(self, message_id)
+
+
+class FakeGuild:
+    def __init__(self, bot: "FakeBot", guild_id: int):
+        self.bot = bot
+        self.id = guild_id
+        self.name = f"Guild {guild_id}"
+        self.icon = None
+
+    def get_member(self, user_id: int):
+        return None
+
+    def get_channel_or_thread(self, channel_id: int) -> FakeChannel:
+        return self.bot.get_partial_messageable(channel_id, guild_id=self.id)
+
+
+class FakeBot:
+    """A Red stand-in. Guilds and channels are created the first time they're asked for."""
+
+    def __init__(self):
+        self.cogs: Dict[str, Any] = {}
+        self.guilds: Dict[int, FakeGuild] = {}
+        self.channels: Dict[int, FakeChannel] = {}
+        self.cached_messages = []
+        self.requests = 0
+
+    def get_cog(self, name: str):
+        return self.cogs.get(name)
+
+    def get_guild(self, guild_id: int) -> FakeGuild:
+        if (guild := self.guilds.get(guild_id)) is None:
+            guild = self.guilds[guild_id] = FakeGuild(self, guild_id)
+        return guild
+
+    def get_partial_messageable(self, channel_id: int, *, guild_id: Optional[int] = None):
+        if (channel := self.channels.get(channel_id)) is None:
+            channel = self.channels[channel_id] = FakeChannel(self, channel_id, guild_id)
+        return channel
+
+    async def get_embed_color(self, location):
+        return discord.Color.red()
+
+    async def wait_until_red_ready(self):
+        return
+
+    def add_view(self, view):
+        pass
+
+    def add_dev_env_value(self, name, value):
+        pass
+
+    def remove_dev_env_value(self, name):
+        pass
+
+
+class FakeResponse:
+    def __init__(self):
+        self.sent = 0
+
+    async def send_message(self, content=None, **kwargs):
+        self.sent += 1
+
+    async def defer(self):
+        pass
+
+
+def fake_interaction(guild_id: int, message_id: int, user_id: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        guild_id=guild_id,
+        guild=SimpleNamespace(id=guild_id),
+        message=SimpleNamespace(id=message_id),
+        user=SimpleNamespace(id=user_id, mention=f"<@{user_id}>"),
+        response=FakeResponse(),
+    )
+
+
+def timer_json(guild_id: int, channel_id: int, ends_at: float, **kwargs) -> Dict[str, Any]:
+    return {
+        "message_id": next(_ids),
+        "channel_id": channel_id,
+        "guild_id": guild_id,
+        "name": "A New Timer!",
+        "emoji": "\U0001f389",
+        "entrants": [],
+        "host": 1,
+        "ends_at": ends_at,
+        **kwargs,
+    }
+
+
+def fake_guild_data(
+    count: int, *, guilds: int = 10, channels: int = 50, start: Optional[float] = None
+) -> Dict[int, Dict[str, Any]]:
+    """Config data for `count` timers spread over `guilds` guilds, ending one every 10ms from `start`."""
+    from timer.timers import guild_defaults
+
+    start = time.time() + 60 if start is None else start
+    data: Dict[int, Dict[str, Any]] = {}
+    for i in range(count):
+        guild_id = 1_000 + i % guilds
+        guild = data.setdefault(guild_id, copy.deepcopy(guild_defaults))
+        guild["timers"].append(timer_json(guild_id, 2_000 + i % channels, start + i / 100))
+    return data
+
+
+@contextmanager
+def patched_config():
+    """Make `Config.get_conf` in the Timer cog return a `FakeConfig`."""
+    with mock.patch("timer.timers.Config", FakeConfig):
+        yield
+
+
+def make_timer_cog(bot: Optional[FakeBot] = None):
+    """Build a Timer cog on top of a FakeBot. Has to be called from inside a running event loop."""
+    from timer.timers import Timer
+
+    bot = bot or FakeBot()
+    with patched_config():
+        cog = Timer(bot)
+    bot.cogs["Timer"] = cog
+    return cog
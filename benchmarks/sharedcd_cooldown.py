@@ -0,0 +1,113 @@
+"""
+Overhead per command invocation of SharedCooldowns' cooldown function.
+
+Compares `CooldownChecker` and the group's `ExpiringCooldownMapping` to the `custom_cooldown`
+function and stock `CooldownMapping` they replaced, for a user that bypasses the group and for
+1000 users that don't, with the group replacing or stacked on the command's own cooldown.
+
+Run from the root of the repository:
+    python -m benchmarks.sharedcd_cooldown [calls]
+"""
+
+import datetime
+import functools
+import logging
+import sys
+import time
+import typing
+from types import SimpleNamespace
+
+from redbot.core import commands
+
+from sharedcd.main import CooldownChecker
+from sharedcd.utils import ExpiringCooldownMapping, SharedCooldown
+
+log = logging.getLogger("red.cray.SharedCooldowns")
+
+
+def custom_cooldown(
+    ctx: commands.Context,
+    *,
+    new_cooldown: commands.CooldownMapping,
+    org_cooldown: typing.Optional[commands.CooldownMapping],
+    scd: SharedCooldown,
+):
+    # the function CooldownChecker replaced, kept here for comparison.
+    if scd.bypass and ctx.author.id in scd.bypass:
+        log.debug(scd.bypass), log.debug(ctx.author.id), log.debug(ctx.author.id in scd.bypass)
+        return None
+    cd = None
+    if org_cooldown and org_cooldown.valid and not scd.replace:
+        cd = org_cooldown
+
+    dt = ctx.message.edited_at or ctx.message.created_at
+    current = dt.replace(tzinfo=datetime.timezone.utc).timestamp()
+    if cd:
+        bucket = new_cooldown.get_bucket(ctx, current)
+        if bucket is not None:
+            bucket.update_rate_limit(current)
+
+    return (cd or new_cooldown).get_bucket(ctx, current)
+
+
+def fake_ctx(user_id: int) -> SimpleNamespace:
+    author = SimpleNamespace(id=user_id)
+    message = SimpleNamespace(
+        author=author, created_at=datetime.datetime.now(datetime.timezone.utc), edited_at=None
+    )
+    return SimpleNamespace(author=author, message=message)
+
+
+def make_group(bypass: int, mapping_cls=ExpiringCooldownMapping) -> SharedCooldown:
+    return SharedCooldown(
+        id="bench",
+        bypass=list(range(1, bypass + 1)),
+        command_names=["ping"],
+        cooldown=30,
+        uses=1,
+        cooldown_mapping=mapping_cls.from_cooldown(1, 30, commands.BucketType.user),
+    )
+
+
+def per_call(func, contexts: list, calls: int) -> float:
+    ctxs = (contexts * (calls // len(contexts) + 1))[:calls]
+    started = time.perf_counter()
+    for ctx in ctxs:
+        # what discord.py does with the bucket in `Command._prepare_cooldowns`.
+        if (bucket := func(ctx)) is not None:
+            bucket.update_rate_limit()
+    return (time.perf_counter() - started) / calls
+
+
+def compare(name: str, contexts: list, calls: int, stacked: bool):
+    # the command's own cooldown is a stock mapping either way, only the group's changed.
+    org = (
+        commands.CooldownMapping.from_cooldown(2, 10, commands.BucketType.user)
+        if stacked
+        else None
+    )
+    old_scd = make_group(50, commands.CooldownMapping)
+    legacy = functools.partial(
+        custom_cooldown, new_cooldown=old_scd.cooldown_mapping, org_cooldown=org, scd=old_scd
+    )
+    old = per_call(legacy, contexts, calls)
+
+    if org is not None:
+        org._cache.clear()
+    new = per_call(CooldownChecker(make_group(50), org), contexts, calls)
+    print(
+        f"{name + ':':<32} custom_cooldown {old * 1e9:7.0f} ns | "
+        f"CooldownChecker {new * 1e9:7.0f} ns ({old / new:.1f}x)"
+    )
+
+
+def main(calls: int = 200_000):
+    users = [fake_ctx(1_000_000 + i) for i in range(1_000)]
+    print(f"calls:                            {calls}")
+    compare("1000 users, replacing group", users, calls, stacked=False)
+    compare("1000 users, stacked group", users, calls, stacked=True)
+    compare("bypassing user", [fake_ctx(50)], calls, stacked=False)
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
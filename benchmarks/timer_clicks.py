@@ -0,0 +1,60 @@
+"""
+Join button throughput with a burst of concurrent clicks against a fake bot.
+
+Run from the root of the repository:
+    python -m benchmarks.timer_clicks [clicks] [timers]
+"""
+
+import asyncio
+import itertools
+import sys
+import time
+from typing import Dict
+
+from .fakes import fake_guild_data, fake_interaction, make_timer_cog
+
+
+async def measure_clicks(cog, clicks: int) -> Dict[str, float]:
+    """Click the join button of the cog's loaded timers `clicks` times, all at once, then flush."""
+    loaded = [timer for guild in cog.cache.values() for timer in guild.values()]
+    interactions = [
+        fake_interaction(timer.guild_id, timer.message_id, 10_000 + i)
+        for i, timer in zip(range(clicks), itertools.cycle(loaded))
+    ]
+    button = cog.view.JTB
+
+    started = time.perf_counter()
+    await asyncio.gather(*(cog.view._callback(button, i) for i in interactions))
+    clicked = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await cog.flush_timers()
+    flushed = time.perf_counter() - started
+
+    return {
+        "clicks": clicks,
+        "click_seconds": clicked,
+        "clicks_per_second": clicks / clicked,
+        "flush_seconds": flushed,
+    }
+
+
+async def run(clicks: int = 10_000, timers: int = 100):
+    cog = make_timer_cog()
+    cog._load_timers(fake_guild_data(timers))
+    result = await measure_clicks(cog, clicks)
+
+    print(f"clicks:           {clicks} over {timers} timers")
+    print(
+        f"click handling:   {result['click_seconds'] * 1000:.2f} ms "
+        f"({result['clicks_per_second']:,.0f} clicks/s)"
+    )
+    print(f"apply + persist:  {result['flush_seconds'] * 1000:.2f} ms")
+
+
+def main(*args: int):
+    asyncio.run(run(*args))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:3]))
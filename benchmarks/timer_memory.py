@@ -0,0 +1,66 @@
+"""
+Memory used by 100k `TimerObj`s compared to the old `__dict__`/`datetime` based layout.
+
+Run from the root of the repository:
+    python -m benchmarks.timer_memory [count]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from timer.models import TimerObj
+
+
+class LegacyTimerObj:
+    # the attribute layout TimerObj had before it was slotted, kept here for comparison.
+    def __init__(self, **kwargs):
+        self.bot = kwargs["bot"]
+        self.message_id = kwargs.get("message_id")
+        self.channel_id = kwargs["channel_id"]
+        self.guild_id = kwargs["guild_id"]
+        self.name = kwargs.get("name", "A New Timer!")
+        self.emoji = kwargs.get("emoji", ":tada:")
+        self._entrants = set(kwargs.get("entrants", {}) or {})
+        self._host = kwargs.get("host")
+        self.ends_at = datetime.fromtimestamp(kwargs["ends_at"], tz=timezone.utc)
+
+
+def measure(cls, count: int, bot: object) -> int:
+    now = time.time()
+    gc.collect()
+    tracemalloc.start()
+    timers = [
+        cls(
+            bot=bot,
+            message_id=1_000_000_000_000_000_000 + i,
+            channel_id=2_000_000_000_000_000_000 + i % 50,
+            guild_id=3_000_000_000_000_000_000 + i % 10,
+            name="A New Timer!",
+            emoji=":tada:",
+            entrants=[],
+            host=4_000_000_000_000_000_000,
+            ends_at=now + 60 + i,
+        )
+        for i in range(count)
+    ]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del timers
+    return size
+
+
+def main(count: int = 100_000):
+    bot = object()
+    legacy = measure(LegacyTimerObj, count, bot)
+    slotted = measure(TimerObj, count, bot)
+    print(f"timers:          {count}")
+    print(f"legacy layout:   {legacy / 1024 / 1024:.2f} MiB ({legacy / count:.0f} B/timer)")
+    print(f"slotted layout:  {slotted / 1024 / 1024:.2f} MiB ({slotted / count:.0f} B/timer)")
+    print(f"saved:           {(legacy - slotted) / 1024 / 1024:.2f} MiB")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
@@ -0,0 +1,163 @@
+"""
+Benchmarks for the Timer cog against a fake bot.
+
+For every size this measures startup (loading the timers from config data through
+`TimerObj.from_json`), memory per timer, the cost of a scheduler tick with both the heap and
+the timing wheel, `get_timer` latency and join button throughput. It also checks that the
+timing wheel hands out exactly the same timers as the heap at every tick. The results are
+written as json so runs of different versions can be compared.
+
+Run from the root of the repository:
+    python -m benchmarks.timer_suite [--sizes 1000 10000 100000] [--output timer_bench.json]
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import platform
+import random
+import statistics
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+from .fakes import fake_guild_data, make_timer_cog
+from .timer_clicks import measure_clicks
+
+
+def _load(cog, data):
+    started = time.perf_counter()
+    cog._load_timers(data)
+    return time.perf_counter() - started
+
+
+async def measure_startup(size: int) -> Dict[str, float]:
+    data = fake_guild_data(size)
+    cog = make_timer_cog()
+    return {"startup_seconds": _load(cog, data)}
+
+
+async def measure_memory(size: int) -> Dict[str, float]:
+    data = fake_guild_data(size)
+    cog = make_timer_cog()
+    gc.collect()
+    tracemalloc.start()
+    cog._load_timers(data)
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"memory_bytes": used, "memory_bytes_per_timer": used / size}
+
+
+def _ticks(size: int, scheduler: str, ticks: int, start: Optional[float] = None):
+    """
+    Advance a virtual clock across the timers' end times in `ticks` steps, timing how long
+    it takes the scheduler to hand out the timers that became due and find the next deadline."""
+    start = time.time() + 60 if start is None else start
+    cog = make_timer_cog()
+    cog._set_scheduler_mode(scheduler)
+    cog._load_timers(fake_guild_data(size, start=start))
+    span = size / 100  # fake_guild_data makes a timer end every 10ms
+
+    for tick in range(ticks):
+        now = start + span * (tick + 1) / ticks
+        started = time.perf_counter()
+        due = cog._queue.pop_due(now)
+        cog._queue.next_deadline()
+        yield time.perf_counter() - started, due
+
+
+async def measure_ticks(size: int, ticks: int = 100) -> Dict[str, float]:
+    result: Dict[str, float] = {}
+    for scheduler, prefix in (("loop", "tick"), ("wheel", "wheel_tick")):
+        durations, popped = [], 0
+        for duration, due in _ticks(size, scheduler, ticks):
+            durations.append(duration)
+            popped += len(due)
+        result.update(
+            {
+                f"{prefix}_mean_seconds": statistics.fmean(durations),
+                f"{prefix}_max_seconds": max(durations),
+                f"{prefix}_timers_per_tick": popped / ticks,
+            }
+        )
+    return result
+
+
+async def measure_wheel_equivalence(size: int, ticks: int = 100) -> Dict[str, bool]:
+    # the fake data is made of new ids every call so compare what was handed out by end time.
+    start = time.time() + 60
+    heap = [sorted(t.ends_at for t in due) for _, due in _ticks(size, "loop", ticks, start)]
+    wheel = [sorted(t.ends_at for t in due) for _, due in _ticks(size, "wheel", ticks, start)]
+    return {"wheel_matches_heap": heap == wheel}
+
+
+async def measure_lookups(size: int, lookups: int = 100_000) -> Dict[str, float]:
+    cog = make_timer_cog()
+    cog._load_timers(fake_guild_data(size))
+    keys = [(t.guild_id, t.message_id) for g in cog.cache.values() for t in g.values()]
+    keys = random.choices(keys, k=lookups)
+
+    started = time.perf_counter()
+    for guild_id, message_id in keys:
+        await cog.get_timer(guild_id, message_id)
+    elapsed = time.perf_counter() - started
+    return {"get_timer_seconds": elapsed / lookups}
+
+
+async def measure_button(size: int, clicks: int) -> Dict[str, float]:
+    cog = make_timer_cog()
+    cog._load_timers(fake_guild_data(size))
+    return {f"button_{k}": v for k, v in (await measure_clicks(cog, clicks)).items()}
+
+
+async def run(sizes: List[int], clicks: int) -> Dict[str, Any]:
+    from timer.timers import Timer
+
+    results: Dict[str, Any] = {
+        "cog_version": Timer.__version__,
+        "python": platform.python_version(),
+        "timestamp": time.time(),
+        "sizes": {},
+    }
+    for size in sizes:
+        result: Dict[str, float] = {}
+        for measure in (
+            measure_startup,
+            measure_memory,
+            measure_ticks,
+            measure_wheel_equivalence,
+            measure_lookups,
+        ):
+            result.update(await measure(size))
+            gc.collect()
+        result.update(await measure_button(size, clicks))
+        results["sizes"][str(size)] = result
+        print(
+            f"{size:>7} timers | "
+            f"startup {result['startup_seconds'] * 1000:8.1f} ms | "
+            f"{result['memory_bytes_per_timer']:6.0f} B/timer | "
+            f"tick {result['tick_mean_seconds'] * 1e6:8.1f} us "
+            f"(wheel {result['wheel_tick_mean_seconds'] * 1e6:8.1f} us, "
+            f"{'same' if result['wheel_matches_heap'] else 'DIFFERENT'} timers) | "
+            f"get_timer {result['get_timer_seconds'] * 1e9:6.0f} ns | "
+            f"{result['button_clicks_per_second']:9,.0f} clicks/s"
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--clicks", type=int, default=10_000)
+    parser.add_argument("--output", default="timer_bench.json")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.sizes, args.clicks))
+    with open(args.output, "w") as fp:
+        json.dump(results, fp, indent=4)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,10 @@
 import asyncio
-import datetime
 import functools
 import itertools
 import logging
 import random
 import string
+import time
 import typing
 
 import discord
@@ -14,7 +14,7 @@ from redbot.core.utils import chat_formatting as cf
 from redbot.vendored.discord.ext.menus import ListPageSource
 
 from .paginator import Paginator
-from .utils import SCDFlags, SCDFlagsAllOPT, SharedCooldown
+from .utils import SCDFlags, SCDFlagsAllOPT, SharedCooldown, UncachedCooldownMapping
 
 log = logging.getLogger("red.cray.SharedCooldowns")
 
@@ -65,29 +65,43 @@ def generate_random_id() -> str:
 #     await ctx.send(str(error))
 
 
-def custom_cooldown(
-    ctx: commands.Context,
-    *,
-    new_cooldown: commands.CooldownMapping,
-    org_cooldown: typing.Optional[commands.CooldownMapping],
-    scd: SharedCooldown,
-):
-    # we need both cooldowns to work simulataneously
-    if scd.bypass and ctx.author.id in scd.bypass:
-        log.debug(scd.bypass), log.debug(ctx.author.id), log.debug(ctx.author.id in scd.bypass)
-        return None
-    cd = None
-    if org_cooldown and org_cooldown.valid and not scd.replace:
-        cd = org_cooldown
+class CooldownChecker:
+    """
+    The cooldown function of a command that's part of a SharedCooldown group.
+
+    Runs on every invocation of the command so everything that can be worked out from the group
+    is done once when the group is loaded instead of on every call."""
+
+    __slots__ = ("scd_id", "new_cooldown", "org_cooldown", "bypass")
+
+    def __init__(
+        self, scd: SharedCooldown, org_cooldown: typing.Optional[commands.CooldownMapping]
+    ):
+        self.scd_id = scd.id
+        self.new_cooldown = scd.cooldown_mapping
+        # we need both cooldowns to work simulataneously, unless the group replaces the original one.
+        self.org_cooldown = (
+            org_cooldown if org_cooldown and org_cooldown.valid and not scd.replace else None
+        )
+        self.bypass = frozenset(scd.bypass)
 
-    dt = ctx.message.edited_at or ctx.message.created_at
-    current = dt.replace(tzinfo=datetime.timezone.utc).timestamp()
-    if cd:
-        bucket = new_cooldown.get_bucket(ctx, current)
-        if bucket is not None:
-            bucket.update_rate_limit(current)
+    def __call__(
+        self, ctx: commands.Context, current: typing.Optional[float] = None
+    ) -> typing.Optional[commands.Cooldown]:
+        if ctx.author.id in self.bypass:
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug(f"{ctx.author.id} bypassed the SharedCooldown {self.scd_id}")
+            return None
 
-    return (cd or new_cooldown).get_bucket(ctx, current)
+        # use the same clock discord.py updates the returned bucket with.
+        current = current or time.time()
+        if self.org_cooldown is not None:
+            bucket = self.new_cooldown.get_bucket(ctx, current)
+            if bucket is not None:
+                bucket.update_rate_limit(current)
+            return self.org_cooldown.get_bucket(ctx, current)
+
+        return self.new_cooldown.get_bucket(ctx, current)
 
 
 class SharedCooldowns(commands.Cog):
@@ -103,6 +117,8 @@ class SharedCooldowns(commands.Cog):
     def __init__(self, bot: Red):
         self.bot = bot
         self._cache: dict[str, SharedCooldown] = {}
+        # command qualified name -> id of the group it's in
+        self._command_index: dict[str, str] = {}
         self.config = Config.get_conf(self, identifier=1234567890)
         self.config.register_global(cooldowns={})
 
@@ -144,20 +160,15 @@ class SharedCooldowns(commands.Cog):
 
     def _load_cooldown(self, scd: SharedCooldown):
         for command_name in scd.command_names:
+            self._command_index[command_name] = scd.id
             command = self.bot.get_command(command_name)
             if command is None:
                 continue
             command.__commands_cooldown__ = org_cooldown = getattr(
                 command, "__commands_cooldown__", command._buckets
             )
-            command._buckets = dcm = commands.DynamicCooldownMapping(
-                functools.partial(
-                    custom_cooldown,
-                    new_cooldown=scd.cooldown_mapping,
-                    org_cooldown=org_cooldown if not scd.replace else None,
-                    scd=scd,
-                ),
-                lambda x: dcm._cache.clear(),  # this cache aint needed.
+            command._buckets = UncachedCooldownMapping(
+                CooldownChecker(scd, org_cooldown), scd.bucket_type
             )
 
         self._cache[scd.id] = scd
@@ -180,10 +191,13 @@ class SharedCooldowns(commands.Cog):
         if save_config:
             await self.config.cooldowns.set(cop)
         self._cache.clear()
+        self._command_index.clear()
         log.debug("Unloaded all SharedCooldowns.")
 
     def _unload_cooldown(self, scd: SharedCooldown):
         for command_name in scd.command_names:
+            if self._command_index.get(command_name) == scd.id:
+                del self._command_index[command_name]
             command = self.bot.get_command(command_name)
             if command is None:
                 continue
@@ -194,8 +208,12 @@ class SharedCooldowns(commands.Cog):
     #     await super().cog_command_error(ctx, error)
     #     await self.bot.on_command_error(ctx, error)
 
+    def get_command_group(self, command_name: str) -> typing.Optional[SharedCooldown]:
+        """The SharedCooldown group a command is part of, if any."""
+        return self._cache.get(self._command_index.get(command_name))
+
     def check_command_exists_as_scd(self, command: commands.Command):
-        return discord.utils.find(lambda x: command in x.command_names, self._cache.values())
+        return self.get_command_group(command.qualified_name)
 
     @commands.group(name="sharedcooldown", aliases=["sharedcd", "sharecd", "scd"])
     @commands.is_owner()
@@ -314,17 +332,27 @@ class SharedCooldowns(commands.Cog):
         if all([getattr(flags, flag.attribute) is None for flag in flags.get_flags().values()]):
             return await ctx.send(f"Atelast one of the flag values must be used.")
 
-        scd.update(
-            bypass=flags.bypass,
-            command_names=list(map(lambda x: x.qualified_name, flags._commands or [])) or None,
-            cooldown=flags.cooldown,
-            replace=flags.replace,
-            bucket_type=flags.bucket,
-            uses=flags.uses,
-        )
+        # unload it first so commands removed from the group get their original cooldown back.
+        self._unload_cooldown(scd)
+        try:
+            scd.update(
+                bypass=flags.bypass,
+                command_names=list(
+                    map(
+                        lambda x: x.qualified_name,
+                        itertools.chain.from_iterable(flags._commands or []),
+                    )
+                )
+                or None,
+                cooldown=flags.cooldown,
+                replace=flags.replace,
+                bucket_type=flags.bucket,
+                uses=flags.uses,
+            )
+        finally:
+            self._load_cooldown(scd)
 
         await self.config.cooldowns.get_attr(scd.id).set(scd.to_dict())
-        self._load_cooldown(scd)
         bnbtds = "\n  - "
         await ctx.send(
             f"SharedCooldown has been updated with new values.\n"
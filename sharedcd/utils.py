@@ -1,5 +1,7 @@
 import datetime
+import heapq
 import itertools
+import time
 import typing
 from dataclasses import asdict, dataclass
 
@@ -7,7 +9,13 @@ import discord
 from redbot.core import commands
 from redbot.core.utils import chat_formatting as cf
 
-__all__ = ["SharedCooldown", "SCDFlags", "SCDFlagsAllOPT"]
+__all__ = [
+    "SharedCooldown",
+    "SCDFlags",
+    "SCDFlagsAllOPT",
+    "ExpiringCooldownMapping",
+    "UncachedCooldownMapping",
+]
 
 # bucket type name to value
 bt_ntv = {
@@ -22,6 +30,74 @@ bt_ntv = {
 }
 
 
+class ExpiringCooldownMapping(commands.CooldownMapping):
+    """
+    A CooldownMapping that drops expired buckets without looking at every bucket.
+
+    The stock mapping scans its whole cache for expired buckets on every command invocation.
+    This one keeps a heap of when each bucket is due to expire, so only buckets that might
+    have expired are looked at. Buckets that were used since get pushed back with their new
+    expiry instead of being dropped."""
+
+    def __init__(self, original: typing.Optional[commands.Cooldown], type):
+        super().__init__(original, type)
+        # (expiry, tiebreaker, bucket key), bucket keys aren't always comparable with each other.
+        self._expiries: list[tuple[float, int, typing.Any]] = []
+        self._counter = itertools.count()
+
+    def copy(self):
+        ret = type(self)(self._cooldown, self._type)
+        ret._cache = self._cache.copy()
+        ret._expiries = self._expiries.copy()
+        return ret
+
+    def _verify_cache_integrity(self, current: typing.Optional[float] = None) -> None:
+        current = current or time.time()
+        expiries = self._expiries
+        while expiries and current > expiries[0][0]:
+            _, _, key = heapq.heappop(expiries)
+            if (bucket := self._cache.get(key)) is None:
+                continue
+            if current > (expiry := bucket._last + bucket.per):
+                del self._cache[key]
+            else:
+                heapq.heappush(expiries, (expiry, next(self._counter), key))
+
+    def get_bucket(
+        self, message, current: typing.Optional[float] = None
+    ) -> typing.Optional[commands.Cooldown]:
+        if self._type is commands.BucketType.default:
+            return self._cooldown
+
+        current = current or time.time()
+        self._verify_cache_integrity(current)
+        key = self._bucket_key(message)
+        if (bucket := self._cache.get(key)) is None:
+            bucket = self.create_bucket(message)
+            if bucket is not None:
+                self._cache[key] = bucket
+                heapq.heappush(self._expiries, (current + bucket.per, next(self._counter), key))
+
+        return bucket
+
+
+class UncachedCooldownMapping(commands.DynamicCooldownMapping):
+    """
+    A DynamicCooldownMapping that asks its factory for the bucket on every invocation.
+
+    The factory is passed the `current` time discord.py checks the cooldown with.
+    The buckets of SharedCooldown groups are kept by the group's own mapping,
+    caching them per command as well would only go stale."""
+
+    def copy(self):
+        return type(self)(self._factory, self._type)
+
+    def get_bucket(
+        self, message, current: typing.Optional[float] = None
+    ) -> typing.Optional[commands.Cooldown]:
+        return self._factory(message, current)
+
+
 class SharedCooldownsDict(typing.TypedDict):
     command_names: list[str]
     # the name of all the commands that are a part of this shared cooldown
@@ -175,7 +251,7 @@ class SharedCooldown:
             self.bucket_type = bucket_type
 
         if cooldown is not None or bucket_type is not None or uses is not None:
-            self.cooldown_mapping = commands.CooldownMapping.from_cooldown(
+            self.cooldown_mapping = ExpiringCooldownMapping.from_cooldown(
                 self.uses, self.cooldown, self.bucket_type
             )
         return self
@@ -196,7 +272,7 @@ class SharedCooldown:
             id=id,
             bucket_type=bucket_type,
             cooldown_mapping=cooldown_mapping
-            or commands.CooldownMapping.from_cooldown(
+            or ExpiringCooldownMapping.from_cooldown(
                 data.get("uses", 1),
                 data.get("cooldown"),
                 bucket_type,
@@ -213,7 +289,7 @@ class SharedCooldown:
                 map(lambda x: x.qualified_name, itertools.chain.from_iterable(flags._commands))
             ),
             cooldown=flags.cooldown.total_seconds(),
-            cooldown_mapping=commands.CooldownMapping.from_cooldown(
+            cooldown_mapping=ExpiringCooldownMapping.from_cooldown(
                 flags.uses,
                 flags.cooldown.total_seconds(),
                 flags.bucket,
@@ -0,0 +1,101 @@
+import math
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+from redbot.core.utils import chat_formatting as cf
+
+if TYPE_CHECKING:
+    from .models import TimerObj
+
+__all__ = ["AdmissionControl"]
+
+
+class AdmissionControl:
+    """
+    Caps on how many timers can be running and how many can end in the same second.
+
+    Keeps its own counts of active timers and of timers ending in each second, per guild and
+    in total, so checking whether a new timer fits is O(1). A cap of 0 means no limit."""
+
+    def __init__(
+        self,
+        max_timers: int = 0,
+        guild_max_timers: int = 0,
+        max_per_second: int = 0,
+        guild_max_per_second: int = 0,
+    ):
+        self.max_timers = max_timers
+        self.guild_max_timers = guild_max_timers
+        self.max_per_second = max_per_second
+        self.guild_max_per_second = guild_max_per_second
+
+        self.active = 0
+        self._guild_active: Dict[int, int] = Counter()
+        # second -> how many timers end in it
+        self._seconds: Dict[int, int] = Counter()
+        self._guild_seconds: Dict[Tuple[int, int], int] = Counter()
+
+    @staticmethod
+    def _second(ends_at: float) -> int:
+        return math.ceil(ends_at)
+
+    def add(self, timer: "TimerObj"):
+        second = self._second(timer.ends_at)
+        self.active += 1
+        self._guild_active[timer.guild_id] += 1
+        self._seconds[second] += 1
+        self._guild_seconds[(timer.guild_id, second)] += 1
+
+    @staticmethod
+    def _decrement(counter: Dict, key):
+        if counter[key] <= 1:
+            counter.pop(key, None)
+        else:
+            counter[key] -= 1
+
+    def discard(self, timer: "TimerObj"):
+        second = self._second(timer.ends_at)
+        self.active -= 1
+        self._decrement(self._guild_active, timer.guild_id)
+        self._decrement(self._seconds, second)
+        self._decrement(self._guild_seconds, (timer.guild_id, second))
+
+    def clear(self):
+        self.active = 0
+        self._guild_active.clear()
+        self._seconds.clear()
+        self._guild_seconds.clear()
+
+    def guild_active(self, guild_id: int) -> int:
+        return self._guild_active.get(guild_id, 0)
+
+    def check(self, guild_id: int, ends_at: float) -> Optional[str]:
+        """Why a new timer ending at `ends_at` can't be started in this guild, or None if it can."""
+        second = self._second(ends_at)
+        if self.guild_max_timers and self.guild_active(guild_id) >= self.guild_max_timers:
+            return (
+                f"This server already has {cf.humanize_number(self.guild_max_timers)} "
+                "timers running, wait for some of them to end."
+            )
+        if self.max_timers and self.active >= self.max_timers:
+            return "Too many timers are running right now, try again later."
+        if (
+            self.guild_max_per_second
+            and self._guild_seconds.get((guild_id, second), 0) >= self.guild_max_per_second
+        ):
+            return "Too many timers in this server end at that time, pick a slightly different duration."
+        if self.max_per_second and self._seconds.get(second, 0) >= self.max_per_second:
+            return "Too many timers end at that time, pick a slightly different duration."
+        return None
+
+    def usage(self, guild_id: int) -> Dict[str, Tuple[int, int]]:
+        """`(current, cap)` pairs, the per second ones are for the busiest second."""
+        return {
+            "guild_active": (self.guild_active(guild_id), self.guild_max_timers),
+            "active": (self.active, self.max_timers),
+            "guild_per_second": (
+                max((n for (g, _), n in self._guild_seconds.items() if g == guild_id), default=0),
+                self.guild_max_per_second,
+            ),
+            "per_second": (max(self._seconds.values(), default=0), self.max_per_second),
+        }
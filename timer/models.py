@@ -1,18 +1,21 @@
 import functools
 import logging
+import math
 import time
 from dataclasses import dataclass
-from datetime import datetime, timezone
-from typing import TYPE_CHECKING, Any, Coroutine, List, Optional, Union
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Iterator, List, Optional, Union
 
 import discord
 from discord.ui import Button, View
 from redbot.core.bot import Red
 from redbot.core.utils import chat_formatting as cf
+from redbot.vendored.discord.ext import menus
 
 from .exceptions import TimerError
 
 if TYPE_CHECKING:
+    from .paginator import Paginator
     from .timers import Timer
 
 log = logging.getLogger("red.craycogs.Timer.models")
@@ -22,6 +25,11 @@ log = logging.getLogger("red.craycogs.Timer.models")
 class TimerSettings:
     notify_users: bool
     emoji: str
+    live_countdown: bool = False
+    large_notify: str = "mentions"
+    large_threshold: int = 1000
+    notify_role: Optional[int] = None
+    coalesce_window: int = 0
 
 
 class TimerView(View):
@@ -33,23 +41,22 @@ class TimerView(View):
         self.add_item(self.JTB)
 
     async def _callback(self, button: "JoinTimerButton", interaction: discord.Interaction):
-        log.debug("callback called")
         cog: "Timer" = self.cog
 
-        timer = await cog.get_timer(interaction.guild.id, interaction.message.id)
+        # this is the hottest path of the cog, keep it free of awaits until the response.
+        timer = cog.get_timer_nowait(interaction.guild_id, interaction.message.id)
         if not timer:
             return await interaction.response.send_message(
                 "This timer does not exist in my database. It might've been erased due to a glitch.",
                 ephemeral=True,
             )
 
-        elif not timer.remaining_seconds:
-            await interaction.response.defer()
-            return await timer.end()
+        elif timer.ended:
+            # the scheduler is already on it, ending it here would end it twice.
+            return await interaction.response.send_message("This timer has ended.", ephemeral=True)
 
-        log.debug("timer exists")
-
-        result = await timer.add_entrant(interaction.user.id)
+        # only buffered here, applied to the timer on the next flush or right before it ends.
+        result = cog.toggle_entrant(timer, interaction.user.id)
         kwargs = {}
 
         if result:
@@ -58,7 +65,6 @@ class TimerView(View):
             )
 
         else:
-            await timer.remove_entrant(interaction.user.id)
             kwargs.update(
                 {
                     "content": f"{interaction.user.mention} you will no longer be notified for the timer."
@@ -85,7 +91,52 @@ class JoinTimerButton(Button[TimerView]):
         self.callback = functools.partial(callback, self)
 
 
+class TimerDigestView(View):
+    def __init__(self, cog: "Timer"):
+        super().__init__(timeout=None)
+        self.bot = cog.bot
+        self.cog = cog
+        self.add_item(DigestButton(self._callback))
+
+    async def _callback(self, button: "DigestButton", interaction: discord.Interaction):
+        entrants = self.cog.notifier.digests.get(interaction.message.id)
+        if entrants is None:
+            # only the latest digests are kept and only until the bot restarts.
+            content = "This timer has ended and who was waiting for it is no longer available."
+
+        elif interaction.user.id in entrants:
+            content = "You were waiting for this timer and it has ended!"
+
+        else:
+            content = "You weren't waiting for this timer."
+
+        await interaction.response.send_message(content, ephemeral=True)
+
+
+class DigestButton(Button[TimerDigestView]):
+    def __init__(self, callback, custom_id="TIMER_DIGEST_BUTTON"):
+        super().__init__(
+            label="Was I waiting for this?",
+            style=discord.ButtonStyle.blurple,
+            custom_id=custom_id,
+        )
+        self.callback = functools.partial(callback, self)
+
+
 class TimerObj:
+    # there can be a lot of these alive at once so skip the per instance __dict__.
+    __slots__ = (
+        "bot",
+        "message_id",
+        "channel_id",
+        "guild_id",
+        "name",
+        "emoji",
+        "_entrants",
+        "_host",
+        "ends_at",
+    )
+
     def __init__(self, **kwargs):
         gid, cid, e, bot = self.check_kwargs(kwargs)
 
@@ -98,7 +149,9 @@ class TimerObj:
         self.emoji: str = kwargs.get("emoji", ":tada:")
         self._entrants: set[int] = set(kwargs.get("entrants", {}) or {})
         self._host: int = kwargs.get("host")
-        self.ends_at: datetime = e
+        # stored as an epoch integer so the scheduler can compare deadlines with plain arithmetic.
+        # rounded up so a timer never ends before its actual end time.
+        self.ends_at: int = math.ceil(e.timestamp() if isinstance(e, datetime) else e)
 
     @property
     def cog(self) -> Optional["Timer"]:
@@ -114,8 +167,11 @@ class TimerObj:
         return self.guild.get_channel_or_thread(self.channel_id)
 
     @property
-    def message(self) -> Coroutine[Any, Any, Optional[discord.Message]]:
-        return self._get_message()
+    def partial_message(self) -> discord.PartialMessage:
+        # lets us edit and reply to the timer message without fetching it first.
+        return self.bot.get_partial_messageable(
+            self.channel_id, guild_id=self.guild_id
+        ).get_partial_message(self.message_id)
 
     @property
     def host(self) -> Optional[discord.Member]:
@@ -130,24 +186,20 @@ class TimerObj:
         return f"https://discord.com/channels/{self.guild_id}/{self.channel_id}/{self.message_id}"
 
     @property
-    def remaining_seconds(self):
-        return self.ends_at - datetime.now(timezone.utc)
+    def remaining_seconds(self) -> timedelta:
+        return timedelta(seconds=self.remaining_time)
 
     @property
-    def remaining_time(self):
-        return self.remaining_seconds.total_seconds()
+    def remaining_time(self) -> float:
+        return self.ends_at - time.time()
 
     @property
     def ended(self):
-        return datetime.now(timezone.utc) > self.ends_at
+        return time.time() > self.ends_at
 
     @property
-    def edit_wait_duration(self):
-        return (
-            15
-            if (secs := self.remaining_time.total_seconds()) <= 120
-            else 60 if secs < 300 else 300
-        )
+    def edit_wait_duration(self) -> int:
+        return 15 if (secs := self.remaining_time) <= 120 else 60 if secs < 300 else 300
 
     @property
     def json(self):
@@ -161,7 +213,7 @@ class TimerObj:
             "emoji": self.emoji,
             "entrants": list(self._entrants),
             "host": self._host,
-            "ends_at": self.ends_at.timestamp(),
+            "ends_at": self.ends_at,
         }
 
     @staticmethod
@@ -184,7 +236,7 @@ class TimerObj:
         return (
             f"<{self.__class__.__name__} "
             f"message_id={self.message_id} name={self.name} "
-            f"emoji={self.emoji} time_remainin={cf.humanize_timedelta(timedelta=self.remaining_time)}>"
+            f"emoji={self.emoji} time_remainin={cf.humanize_timedelta(seconds=max(self.remaining_time, 0))}>"
         )
 
     def __repr__(self) -> str:
@@ -194,99 +246,192 @@ class TimerObj:
         return hash((self.message_id, self.channel_id))
 
     async def get_embed_description(self):
-        return (
+        settings = self.cog.get_guild_settings(self.guild_id)
+        description = (
             f"React with {self.emoji} to be notified when the timer ends.\n"
-            f"Remaining time: **<t:{int(time.time() + self.remaining_time)}:R>** (<t:{int(time.time() + self.remaining_time)}:F>)\n"
-            if (await self.cog.get_guild_settings(self.guild_id)).notify_users
-            else f"Remaining time: **<t:{int(time.time() + self.remaining_time)}:R>** (<t:{int(time.time() + self.remaining_time)}:F>)\n"
+            f"Remaining time: **<t:{self.ends_at}:R>** (<t:{self.ends_at}:F>)\n"
+            if settings.notify_users
+            else f"Remaining time: **<t:{self.ends_at}:R>** (<t:{self.ends_at}:F>)\n"
         )
+        if settings.live_countdown:
+            description += (
+                f"Time left: **{cf.humanize_timedelta(seconds=max(self.remaining_time, 1))}**\n"
+            )
+        return description
 
     async def get_embed_color(self):
         return await self.bot.get_embed_color(self.channel)
 
-    async def _get_message(self, message_id: int = None) -> Optional[discord.Message]:
-        message_id = message_id or self.message_id
-        msg = list(filter(lambda x: x.id == message_id, self.bot.cached_messages))
-        if msg:
-            return msg[0]
-        try:
-            msg = await self.channel.fetch_message(message_id)
-        except Exception:
-            msg = None
-        return msg
-
-    async def add_entrant(self, user_id: int):
-        if user_id == self._host or user_id in self._entrants:
-            return False
-        self._entrants.add(user_id)
-        return True
-
-    async def remove_entrant(self, user_id: int):
-        if user_id == self._host or user_id not in self._entrants:
-            return False
-        self._entrants.remove(user_id)
-        return True
-
-    async def start(self):
-        embed = (
+    async def get_embed(self, description: str) -> discord.Embed:
+        host = self.host
+        return (
             discord.Embed(
                 title=f"Timer for **{self.name}**",
-                description=await self.get_embed_description(),
+                description=description,
                 color=await self.get_embed_color(),
             )
             .set_thumbnail(url=getattr(self.guild.icon, "url", ""))
-            .set_footer(text=f"Hosted by: {self.host}", icon_url=self.host.display_avatar.url)
+            .set_footer(
+                text=f"Hosted by: {host or self._host}",
+                icon_url=getattr(getattr(host, "display_avatar", None), "url", None),
+            )
+        )
+
+    async def update_countdown(self):
+        await self.partial_message.edit(
+            embed=await self.get_embed(await self.get_embed_description())
         )
 
+    async def start(self):
+        embed = await self.get_embed(await self.get_embed_description())
+
         kwargs = {
             "embed": embed,
         }
-        if (await self.cog.get_guild_settings(self.guild_id)).notify_users:
-            kwargs.update({"view": TimerView(self.cog, self.emoji, False)})
+        if self.cog.get_guild_settings(self.guild_id).notify_users:
+            kwargs.update({"view": self.cog.get_view(self.emoji, False)})
 
         msg: discord.Message = await self.channel.send(**kwargs)
 
         self.message_id = msg.id
-        kwargs["view"].stop()
 
         await self.cog.add_timer(self)
 
-    async def end(self):
-        msg = await self.message
-        if not msg:
+    @property
+    def end_message(self) -> str:
+        return (
+            f"{getattr(self.host, 'mention', f'{self._host} (host user not found)')} your timer for **{self.name}** has ended!\n"
+            + self.jump_url
+        )
+
+    async def _close(self, settings: TimerSettings):
+        """Edit the timer's message to show that it has ended."""
+        stats = self.cog.stats
+        embed = await self.get_embed("This timer has ended!")
+        view = self.cog.get_view(settings.emoji, True)
+
+        try:
+            with stats.measure("edit", guild_id=self.guild_id):
+                await self.partial_message.edit(embed=embed, view=view)
+        except discord.NotFound:
             await self.cog.remove_timer(self)
             raise TimerError(
                 f"Couldn't find timer message with id {self.message_id}. Removing from cache."
             )
 
-        embed: discord.Embed = msg.embeds[0]
+        if self.ended:
+            # timers ended early with `[p]timer end` aren't late.
+            stats.record_drift(self.ends_at, time.time(), guild_id=self.guild_id)
 
-        embed.description = "This timer has ended!"
+    async def end(self):
+        """End the timer, does nothing if it's already being ended or was ended already."""
+        if not self.cog.mark_ending(self):
+            return
+        try:
+            await self._end()
+        finally:
+            self.cog.unmark_ending(self)
 
-        settings = await self.cog.get_guild_settings(self.guild_id)
+    async def _end(self):
+        started = time.perf_counter()
+        stats = self.cog.stats
+        # make sure clicks that haven't been flushed yet still get notified.
+        self.cog.apply_entrant_buffer()
+        msg = self.partial_message
 
-        view = TimerView(self.cog, settings.emoji, True)
+        settings = self.cog.get_guild_settings(self.guild_id)
 
-        await msg.edit(embed=embed, view=view)
+        await self._close(settings)
 
         notify = settings.notify_users
 
-        rep = await msg.reply(
-            f"{getattr(self.host, 'mention', f'{self._host} (host user not found)')} your timer for **{self.name}** has ended!\n"
-            + self.jump_url
-        )
-
-        pings = (
-            " ".join((i.mention for i in self.entrants if i is not None))
-            if self._entrants and notify
-            else ""
-        )
+        with stats.measure("reply", guild_id=self.guild_id):
+            rep = await msg.reply(self.end_message)
 
-        if pings:
-            for page in cf.pagify(pings, delims=[" "], page_length=2000):
-                await msg.channel.send(page, reference=rep.to_reference(fail_if_not_exists=False))
+        if self._entrants and notify:
+            with stats.measure("pings", guild_id=self.guild_id, entrants=len(self._entrants)):
+                await self.cog.notifier.notify(
+                    rep.channel,
+                    self.guild_id,
+                    self._entrants,
+                    reference=rep.to_reference(fail_if_not_exists=False),
+                )
 
         await self.cog.remove_timer(self)
+        stats.record("end", time.perf_counter() - started, guild_id=self.guild_id)
+
+    @staticmethod
+    async def end_together(timers: List["TimerObj"]) -> List[Optional[Exception]]:
+        """
+        End timers of the same channel with a single combined reply and one set of pings.
+
+        Every timer's message is still edited on its own. Returns the error each timer
+        ended with, or None if it ended fine. Timers that are already being ended or were
+        ended while they waited to be ended here are skipped."""
+        errors: List[Optional[Exception]] = [None] * len(timers)
+        # claimed before the first await so nothing else can start ending them meanwhile.
+        claimed = [i for i, timer in enumerate(timers) if timer.cog.mark_ending(timer)]
+        try:
+            for i, error in zip(
+                claimed, await TimerObj._end_together([timers[i] for i in claimed])
+            ):
+                errors[i] = error
+        finally:
+            for i in claimed:
+                timers[i].cog.unmark_ending(timers[i])
+        return errors
+
+    @staticmethod
+    async def _end_together(timers: List["TimerObj"]) -> List[Optional[Exception]]:
+        errors: List[Optional[Exception]] = [None] * len(timers)
+        if not timers:
+            return errors
+
+        if len(timers) == 1:
+            try:
+                await timers[0]._end()
+            except Exception as e:
+                return [e]
+            return [None]
+
+        started = time.perf_counter()
+        first = timers[0]
+        cog, stats = first.cog, first.cog.stats
+        cog.apply_entrant_buffer()
+        settings = cog.get_guild_settings(first.guild_id)
+
+        for i, timer in enumerate(timers):
+            try:
+                await timer._close(settings)
+            except Exception as e:
+                errors[i] = e
+
+        ended = [timer for timer, error in zip(timers, errors) if error is None]
+        if not ended:
+            return errors
+
+        with stats.measure("reply", guild_id=first.guild_id, timers=len(ended)):
+            pages = list(cf.pagify("\n".join(timer.end_message for timer in ended)))
+            rep = await ended[0].partial_message.reply(pages[0])
+            for page in pages[1:]:
+                await rep.channel.send(page)
+
+        entrants = set().union(*(timer._entrants for timer in ended))
+        if entrants and settings.notify_users:
+            with stats.measure("pings", guild_id=first.guild_id, entrants=len(entrants)):
+                await cog.notifier.notify(
+                    rep.channel,
+                    first.guild_id,
+                    entrants,
+                    reference=rep.to_reference(fail_if_not_exists=False),
+                )
+
+        for timer in ended:
+            await cog.remove_timer(timer)
+        stats.record(
+            "end", time.perf_counter() - started, guild_id=first.guild_id, timers=len(ended)
+        )
+        return errors
 
     @classmethod
     def from_json(cls, json: dict):
@@ -301,6 +446,47 @@ class TimerObj:
                 "emoji": json.get("emoji", ":tada:"),
                 "entrants": json.get("entrants", []),
                 "host": json.get("host"),
-                "ends_at": datetime.fromtimestamp(e, tz=timezone.utc),
+                "ends_at": e,
             }
         )
+
+
+class TimerListSource(menus.PageSource):
+    """
+    Pages of timers, soonest to end first.
+
+    Timers are only pulled from `timers` when a page that needs them is viewed and
+    only the page being viewed is rendered."""
+
+    def __init__(self, title: str, timers: Iterator[TimerObj], count: int, per_page: int = 10):
+        self.title = title
+        self.per_page = per_page
+        self._timers = timers
+        self._count = count
+        self._seen: List[TimerObj] = []
+
+    def is_paginating(self) -> bool:
+        return self._count > self.per_page
+
+    def get_max_pages(self) -> int:
+        return max(math.ceil(self._count / self.per_page), 1)
+
+    async def get_page(self, page_number: int) -> List[TimerObj]:
+        end = (page_number + 1) * self.per_page
+        while len(self._seen) < end and (timer := next(self._timers, None)) is not None:
+            self._seen.append(timer)
+        return self._seen[page_number * self.per_page : end]
+
+    async def format_page(self, menu: "Paginator", timers: List[TimerObj]) -> discord.Embed:
+        return discord.Embed(
+            title=self.title,
+            description="\n".join(
+                "{} - {}".format(
+                    f"[{x.name}]({x.jump_url})",
+                    cf.humanize_timedelta(timedelta=x.remaining_seconds) or "Ending now",
+                )
+                for x in timers
+            )
+            or "These timers have ended.",
+            color=await menu.ctx.embed_color(),
+        )
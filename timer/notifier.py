@@ -0,0 +1,90 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Collection, FrozenSet, Optional
+
+import discord
+
+from .models import TimerDigestView
+from .utils import chunk_mentions
+
+if TYPE_CHECKING:
+    from .timers import Timer
+
+log = logging.getLogger("red.craycogs.Timer.notifier")
+
+__all__ = ["Notifier"]
+
+
+class Notifier:
+    """
+    Notifies the entrants of a timer when it ends.
+
+    Mentions are chunked straight from the entrant ids and the pages are sent a few at a time.
+    Guilds can choose to ping a role or post a single digest message instead
+    once a timer has more entrants than their configured threshold."""
+
+    def __init__(self, cog: "Timer", concurrency: int = 3, max_digests: int = 100):
+        self.cog = cog
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._max_digests = max_digests
+        # digest message id -> entrants of the timer, so the digest button can answer whether someone was in it.
+        self.digests: "OrderedDict[int, FrozenSet[int]]" = OrderedDict()
+        # only ever sent for its components, the persistent view added in cog_load handles the button.
+        self._digest_view = TimerDigestView(cog)
+        self._digest_view.stop()
+
+    async def _send(self, channel: discord.abc.Messageable, content: str, **kwargs):
+        async with self._semaphore:
+            return await channel.send(content, **kwargs)
+
+    async def notify(
+        self,
+        channel: discord.abc.Messageable,
+        guild_id: int,
+        user_ids: Collection[int],
+        *,
+        reference: Optional[discord.MessageReference] = None,
+    ):
+        if not user_ids:
+            return
+
+        settings = self.cog.get_guild_settings(guild_id)
+        if len(user_ids) > settings.large_threshold:
+            if settings.large_notify == "role" and settings.notify_role:
+                return await channel.send(
+                    f"<@&{settings.notify_role}>",
+                    reference=reference,
+                    allowed_mentions=discord.AllowedMentions(
+                        roles=[discord.Object(settings.notify_role)]
+                    ),
+                )
+
+            elif settings.large_notify == "digest":
+                return await self.send_digest(channel, user_ids, reference=reference)
+
+        results = await asyncio.gather(
+            *(self._send(channel, page, reference=reference) for page in chunk_mentions(user_ids)),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                log.error("Failed to send a page of timer pings", exc_info=result)
+
+    async def send_digest(
+        self,
+        channel: discord.abc.Messageable,
+        user_ids: Collection[int],
+        *,
+        reference: Optional[discord.MessageReference] = None,
+    ):
+        msg = await channel.send(
+            f"**{len(user_ids)}** users were waiting for this timer.\n"
+            "Press the button below to check whether you were one of them.",
+            reference=reference,
+            view=self._digest_view,
+        )
+        self.digests[msg.id] = frozenset(user_ids)
+        while len(self.digests) > self._max_digests:
+            self.digests.popitem(last=False)
+        return msg
@@ -0,0 +1,131 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from .models import TimerObj
+
+log = logging.getLogger("red.craycogs.Timer.pipeline")
+
+__all__ = ["EndPipeline"]
+
+
+class EndPipeline:
+    """
+    Ends timers with a global cap on how many end at once.
+
+    Every channel gets its own queue and worker so that the messages sent to one channel
+    go out in the order their timers were due, while the semaphore keeps a burst of timers
+    ending in the same second from running into ratelimits.
+    Guilds with a coalescing window get the timers of a channel ending within it announced together.
+    """
+
+    def __init__(self, concurrency: int = 5):
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._concurrency = concurrency
+        self._queues: Dict[int, Deque[Tuple["TimerObj", float, asyncio.Future]]] = {}
+        self._workers: Dict[int, asyncio.Task] = {}
+        self._latencies: Deque[float] = deque(maxlen=100)
+
+    @property
+    def concurrency(self) -> int:
+        return self._concurrency
+
+    @concurrency.setter
+    def concurrency(self, value: int):
+        # timers already waiting on the old semaphore keep using it, new ones use the new cap.
+        self._concurrency = value
+        self._semaphore = asyncio.Semaphore(value)
+
+    @property
+    def depth(self) -> int:
+        """The number of timers waiting to be ended."""
+        return sum(map(len, self._queues.values()))
+
+    @property
+    def busy_channels(self) -> int:
+        return len(self._workers)
+
+    @property
+    def drain_latency(self) -> Optional[float]:
+        """The average seconds between a timer being queued and it being ended, over the last 100 timers."""
+        if not self._latencies:
+            return None
+        return sum(self._latencies) / len(self._latencies)
+
+    @property
+    def last_drain_latency(self) -> Optional[float]:
+        return self._latencies[-1] if self._latencies else None
+
+    def submit(self, timer: "TimerObj") -> asyncio.Future:
+        """Queue a timer to be ended. The returned future resolves once `TimerObj.end` is done."""
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(timer.channel_id, deque()).append(
+            (timer, time.perf_counter(), future)
+        )
+        if timer.channel_id not in self._workers:
+            self._workers[timer.channel_id] = asyncio.create_task(self._drain(timer.channel_id))
+        return future
+
+    async def _coalesce(
+        self, queue: Deque[Tuple["TimerObj", float, asyncio.Future]], first: "TimerObj"
+    ) -> List[Tuple["TimerObj", float, asyncio.Future]]:
+        """
+        Wait out the guild's coalescing window and take the timers queued up meanwhile.
+
+        Timers are queued in the order they're due so this only looks at the front of the queue."""
+        cog = first.cog
+        window = cog.get_guild_settings(first.guild_id).coalesce_window
+        # nothing to wait for if it was already ended, `end_together` skips it.
+        if not window or cog.get_timer_nowait(first.guild_id, first.message_id) is not first:
+            return []
+
+        # timers ended early with `[p]timer end` start their window right away.
+        deadline = min(first.ends_at, time.time()) + window
+        # the scheduler queues the rest of the window's timers as they become due.
+        await asyncio.sleep(max(deadline - time.time(), 0))
+        batch = []
+        while queue and queue[0][0].ends_at <= deadline:
+            batch.append(queue.popleft())
+        return batch
+
+    async def _drain(self, channel_id: int):
+        queue = self._queues[channel_id]
+        batch: List[Tuple["TimerObj", float, asyncio.Future]] = []
+        try:
+            while queue:
+                batch = [queue.popleft()]
+                batch += await self._coalesce(queue, batch[0][0])
+                async with self._semaphore:
+                    try:
+                        errors = await TimerObj.end_together([timer for timer, _, _ in batch])
+                    except Exception as e:
+                        errors = [e] * len(batch)
+                for (_, queued_at, future), error in zip(batch, errors):
+                    if not future.done():
+                        if error is None:
+                            future.set_result(None)
+                        else:
+                            future.set_exception(error)
+                    self._latencies.append(time.perf_counter() - queued_at)
+                batch = []
+        except asyncio.CancelledError:
+            # `close` only cancels the futures still queued, this batch was already taken off.
+            for _, _, future in batch:
+                future.cancel()
+            raise
+        finally:
+            # `close` might've already replaced us, don't drop the new worker's state.
+            if self._workers.get(channel_id) is asyncio.current_task():
+                del self._workers[channel_id]
+                self._queues.pop(channel_id, None)
+
+    def close(self):
+        for worker in self._workers.values():
+            worker.cancel()
+        for queue in self._queues.values():
+            for _, _, future in queue:
+                future.cancel()
+        self._workers.clear()
+        self._queues.clear()
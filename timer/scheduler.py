@@ -0,0 +1,311 @@
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    from .models import TimerObj
+
+__all__ = ["TimerHeap", "DeadlineHandles", "TimingWheel"]
+
+
+class TimerHeap:
+    """
+    A priority queue of timers keyed on their `ends_at`.
+
+    Removal is lazy, the heap entry is just marked as dead and skipped when it reaches the top.
+    This keeps both `push` and `discard` at O(log n) and the loop never has to look at
+    timers that aren't due yet."""
+
+    def __init__(self):
+        self._heap: List[list] = []
+        self._entries: Dict[Tuple[int, int], list] = {}
+        self._counter = itertools.count()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        # unordered, use `next_deadline`/`pop_due` when the order matters.
+        return (entry[-1] for entry in self._entries.values())
+
+    def __contains__(self, timer: "TimerObj"):
+        return (timer.guild_id, timer.message_id) in self._entries
+
+    @staticmethod
+    def _deadline(timer: "TimerObj") -> float:
+        return timer.ends_at
+
+    def push(self, timer: "TimerObj", deadline: Optional[float] = None):
+        """Add a timer, keyed on `deadline` if passed or its `ends_at` otherwise."""
+        key = (timer.guild_id, timer.message_id)
+        if key in self._entries:
+            self.discard(timer)
+        # the counter breaks ties between timers ending at the same time since TimerObj isn't orderable
+        entry = [
+            self._deadline(timer) if deadline is None else deadline,
+            next(self._counter),
+            timer,
+        ]
+        self._entries[key] = entry
+        heapq.heappush(self._heap, entry)
+
+    def extend(self, timers: Iterable["TimerObj"]):
+        """Add a lot of timers at once, heapifying once instead of pushing each of them."""
+        for timer in timers:
+            key = (timer.guild_id, timer.message_id)
+            if (old := self._entries.get(key)) is not None:
+                old[-1] = None
+            entry = [self._deadline(timer), next(self._counter), timer]
+            self._entries[key] = entry
+            self._heap.append(entry)
+        heapq.heapify(self._heap)
+
+    def discard(self, timer: "TimerObj"):
+        entry = self._entries.pop((timer.guild_id, timer.message_id), None)
+        if entry is not None:
+            entry[-1] = None
+
+    def _prune(self):
+        while self._heap and self._heap[0][-1] is None:
+            heapq.heappop(self._heap)
+
+    def next_deadline(self) -> Optional[float]:
+        """The timestamp at which the earliest timer ends, or None if there are no timers."""
+        self._prune()
+        return self._heap[0][0] if self._heap else None
+
+    def ordered(self, timers: Iterable["TimerObj"]) -> Iterator["TimerObj"]:
+        """
+        Lazily yield those of `timers` that are queued, earliest deadline first.
+
+        Only the queue's own entries of the given timers are heapified, so getting the first
+        few costs O(n + k log n) instead of sorting all of them."""
+        heap = [
+            entry
+            for timer in timers
+            if (entry := self._entries.get((timer.guild_id, timer.message_id))) is not None
+        ]
+        heapq.heapify(heap)
+        while heap:
+            # the entry is shared with the queue so this also skips timers discarded meanwhile.
+            if (timer := heapq.heappop(heap)[-1]) is not None:
+                yield timer
+
+    def pop_due(self, now: float, limit: Optional[int] = None) -> List["TimerObj"]:
+        """Pop and return every timer that ends at or before `now`, at most `limit` of them."""
+        due = []
+        self._prune()
+        while self._heap and self._heap[0][0] <= now and (limit is None or len(due) < limit):
+            _, _, timer = heapq.heappop(self._heap)
+            if timer is not None:
+                del self._entries[(timer.guild_id, timer.message_id)]
+                due.append(timer)
+            self._prune()
+        return due
+
+    def clear(self):
+        self._heap.clear()
+        self._entries.clear()
+
+
+class DeadlineHandles:
+    """
+    Fires timers straight from the event loop with `loop.call_at`.
+
+    Timers are bucketed by the second they end in and each bucket gets a single timer handle,
+    so there is no global loop to restart when a timer is started or ended early.
+    Cancelling the last timer of a second cancels its handle too."""
+
+    def __init__(self, callback: Callable[[List["TimerObj"]], None]):
+        self.callback = callback
+        self._buckets: Dict[int, Set["TimerObj"]] = {}
+        self._handles: Dict[int, asyncio.TimerHandle] = {}
+
+    def __len__(self):
+        return len(self._handles)
+
+    @staticmethod
+    def _second(timer: "TimerObj") -> int:
+        return math.ceil(timer.ends_at)
+
+    def add(self, timer: "TimerObj"):
+        second = self._second(timer)
+        bucket = self._buckets.setdefault(second, set())
+        bucket.add(timer)
+        if second in self._handles:
+            return
+
+        loop = asyncio.get_running_loop()
+        # loop.time() is monotonic and has nothing to do with the wall clock so convert the delay.
+        delay = max(second - time.time(), 0)
+        self._handles[second] = loop.call_at(loop.time() + delay, self._fire, second)
+
+    def discard(self, timer: "TimerObj"):
+        second = self._second(timer)
+        if not (bucket := self._buckets.get(second)):
+            return
+        bucket.discard(timer)
+        if not bucket:
+            del self._buckets[second]
+            self._handles.pop(second).cancel()
+
+    def _fire(self, second: int):
+        self._handles.pop(second, None)
+        timers = self._buckets.pop(second, set())
+        if timers:
+            self.callback(list(timers))
+
+    def clear(self):
+        for handle in self._handles.values():
+            handle.cancel()
+        self._handles.clear()
+        self._buckets.clear()
+
+
+class TimingWheel:
+    """
+    A hierarchical timing wheel of seconds, minutes and hours with an overflow for anything further out.
+
+    Has the same interface as `TimerHeap`. Inserting and cancelling a timer is O(1), timers
+    further away than the current minute sit in a coarser wheel and are cascaded down when
+    the cursor reaches their minute/hour/day. This scales to far more timers than the heap
+    at the cost of only being accurate to the second."""
+
+    def __init__(self):
+        self._seconds: List[Dict[Tuple[int, int], "TimerObj"]] = [{} for _ in range(60)]
+        self._minutes: List[Dict[Tuple[int, int], "TimerObj"]] = [{} for _ in range(60)]
+        self._hours: List[Dict[Tuple[int, int], "TimerObj"]] = [{} for _ in range(24)]
+        self._days: Dict[int, Dict[Tuple[int, int], "TimerObj"]] = {}
+        # timers whose deadline had already passed when they were added.
+        self._expired: Dict[Tuple[int, int], "TimerObj"] = {}
+        # key -> (deadline, the slot it currently sits in)
+        self._entries: Dict[Tuple[int, int], Tuple[int, dict]] = {}
+        # every deadline up to and including this second has been handed out.
+        self._cursor = int(time.time())
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        # unordered, use `next_deadline`/`pop_due` when the order matters.
+        return (slot[key] for key, (_, slot) in self._entries.items())
+
+    def __contains__(self, timer: "TimerObj"):
+        return (timer.guild_id, timer.message_id) in self._entries
+
+    def _slot(self, deadline: int) -> dict:
+        cursor = self._cursor
+        if deadline <= cursor:
+            return self._expired
+        if deadline // 60 == cursor // 60:
+            return self._seconds[deadline % 60]
+        if deadline // 3600 == cursor // 3600:
+            return self._minutes[deadline // 60 % 60]
+        if deadline // 86400 == cursor // 86400:
+            return self._hours[deadline // 3600 % 24]
+        return self._days.setdefault(deadline // 86400, {})
+
+    def _place(self, key: Tuple[int, int], timer: "TimerObj", deadline: int):
+        slot = self._slot(deadline)
+        slot[key] = timer
+        self._entries[key] = (deadline, slot)
+
+    def push(self, timer: "TimerObj", deadline: Optional[float] = None):
+        key = (timer.guild_id, timer.message_id)
+        if key in self._entries:
+            self.discard(timer)
+        if not self._entries and not self._expired:
+            # nothing to cascade, skip the cursor past the time the wheel sat empty.
+            self._cursor = max(self._cursor, int(time.time()))
+        self._place(key, timer, math.ceil(timer.ends_at if deadline is None else deadline))
+
+    def extend(self, timers: Iterable["TimerObj"]):
+        for timer in timers:
+            self.push(timer)
+
+    def discard(self, timer: "TimerObj"):
+        key = (timer.guild_id, timer.message_id)
+        if (entry := self._entries.pop(key, None)) is not None:
+            del entry[1][key]
+
+    def _cascade(self, slot: dict):
+        # re-place every timer of a coarser slot now that the cursor has reached it.
+        timers = list(slot.items())
+        slot.clear()
+        for key, timer in timers:
+            self._place(key, timer, self._entries[key][0])
+
+    def _advance(self, now: int):
+        while self._cursor < now:
+            if len(self._entries) == len(self._expired):
+                # the wheels are empty, nothing to cascade on the way.
+                self._cursor = now
+                return
+
+            second = self._cursor + 1
+            self._cursor = second
+            if second % 86400 == 0:
+                self._cascade(self._days.pop(second // 86400, {}))
+            if second % 3600 == 0:
+                self._cascade(self._hours[second // 3600 % 24])
+            if second % 60 == 0:
+                self._cascade(self._minutes[second // 60 % 60])
+
+            # everything in this second's slot is due now.
+            if slot := self._seconds[second % 60]:
+                self._expired.update(slot)
+                for key in slot:
+                    self._entries[key] = (self._entries[key][0], self._expired)
+                slot.clear()
+
+    def next_deadline(self) -> Optional[float]:
+        """
+        The timestamp at which the earliest timer ends, or None if there are no timers.
+
+        For timers outside the current minute this is the start of the next minute instead,
+        when they get cascaded down to the seconds wheel."""
+        if not self._entries:
+            return None
+        if self._expired:
+            return self._cursor
+        for second in range(self._cursor + 1, (self._cursor // 60 + 1) * 60):
+            if self._seconds[second % 60]:
+                return second
+        return (self._cursor // 60 + 1) * 60
+
+    def ordered(self, timers: Iterable["TimerObj"]) -> Iterator["TimerObj"]:
+        """Lazily yield those of `timers` that are queued, earliest deadline first."""
+        heap = []
+        for timer in timers:
+            key = (timer.guild_id, timer.message_id)
+            if (entry := self._entries.get(key)) is not None:
+                heap.append((entry[0], key))
+        heapq.heapify(heap)
+        while heap:
+            _, key = heapq.heappop(heap)
+            if (entry := self._entries.get(key)) is not None:
+                yield entry[1][key]
+
+    def pop_due(self, now: float, limit: Optional[int] = None) -> List["TimerObj"]:
+        """Pop and return every timer that ends at or before `now`, at most `limit` of them."""
+        self._advance(int(now))
+        if not self._expired:
+            return []
+
+        # hand out the earliest first, like the heap would.
+        keys = sorted(self._expired, key=lambda key: self._entries[key][0])[:limit]
+        due = []
+        for key in keys:
+            due.append(self._expired.pop(key))
+            del self._entries[key]
+        return due
+
+    def clear(self):
+        for slot in itertools.chain(self._seconds, self._minutes, self._hours):
+            slot.clear()
+        self._days.clear()
+        self._expired.clear()
+        self._entries.clear()
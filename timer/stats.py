@@ -0,0 +1,114 @@
+import bisect
+import json
+import logging
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+log = logging.getLogger("red.craycogs.Timer.stats")
+
+__all__ = ["RollingHistogram", "TimerStats", "log_hook"]
+
+# upper bounds (in seconds) of the histogram buckets, anything above the last one goes in the overflow bucket.
+BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def _pick(ordered: List[float], p: float) -> float:
+    return ordered[min(int(len(ordered) * p / 100), len(ordered) - 1)]
+
+
+class RollingHistogram:
+    """A histogram over the last `size` samples."""
+
+    def __init__(self, size: int = 1000, buckets: Tuple[float, ...] = BUCKETS):
+        self._samples: Deque[float] = deque(maxlen=size)
+        self._bounds = buckets
+        self._counts = [0] * (len(buckets) + 1)
+
+    def __len__(self):
+        return len(self._samples)
+
+    def add(self, value: float):
+        if len(self._samples) == self._samples.maxlen:
+            # keep the bucket counts in sync with the window.
+            self._counts[bisect.bisect_left(self._bounds, self._samples[0])] -= 1
+        self._samples.append(value)
+        self._counts[bisect.bisect_left(self._bounds, value)] += 1
+
+    def clear(self):
+        self._samples.clear()
+        self._counts = [0] * (len(self._bounds) + 1)
+
+    @property
+    def buckets(self) -> List[Tuple[Optional[float], int]]:
+        """`(upper bound, count)` pairs, the overflow bucket has None as its bound."""
+        return list(zip((*self._bounds, None), self._counts))
+
+    def percentile(self, p: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        return _pick(sorted(self._samples), p)
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        if not self._samples:
+            return {"count": 0}
+        ordered = sorted(self._samples)
+        return {
+            "count": len(ordered),
+            "mean": sum(ordered) / len(ordered),
+            "p50": _pick(ordered, 50),
+            "p90": _pick(ordered, 90),
+            "p99": _pick(ordered, 99),
+            "max": ordered[-1],
+        }
+
+
+def log_hook(event: Dict[str, Any]):
+    """A hook that logs every sample as a json line."""
+    log.info(json.dumps(event))
+
+
+class TimerStats:
+    """
+    Rolling histograms of how late timers end and how long each part of ending them takes.
+
+    `hook`, if set, is called with a dict for every sample recorded."""
+
+    STAGES = ("tick", "end", "edit", "reply", "pings")
+
+    def __init__(self, size: int = 1000):
+        self.drift = RollingHistogram(size)
+        self.stages: Dict[str, RollingHistogram] = {
+            stage: RollingHistogram(size) for stage in self.STAGES
+        }
+        self.hook: Optional[Callable[[Dict[str, Any]], Any]] = None
+
+    def _emit(self, event: Dict[str, Any]):
+        if self.hook is None:
+            return
+        try:
+            self.hook(event)
+        except Exception:
+            log.exception("The timer stats hook raised an error")
+
+    def record_drift(self, due: float, ended: float, **extra):
+        self.drift.add(ended - due)
+        self._emit({"type": "drift", "seconds": ended - due, **extra})
+
+    def record(self, stage: str, seconds: float, **extra):
+        self.stages[stage].add(seconds)
+        self._emit({"type": "stage", "stage": stage, "seconds": seconds, **extra})
+
+    @contextmanager
+    def measure(self, stage: str, **extra) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - started, **extra)
+
+    def clear(self):
+        self.drift.clear()
+        for histogram in self.stages.values():
+            histogram.clear()
@@ -0,0 +1,265 @@
+import asyncio
+import json
+import logging
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
+
+from redbot.core import Config
+
+if TYPE_CHECKING:
+    from .models import TimerObj
+
+log = logging.getLogger("red.craycogs.Timer.storage")
+
+__all__ = ["TimerStorage", "ConfigStorage", "JournalStorage"]
+
+
+class TimerStorage:
+    """
+    Base class for where timers are persisted.
+
+    The cog reports every change to a timer through `timer_added`, `timer_removed` and
+    `entrant_changed` and calls `flush` periodically and `close` on unload."""
+
+    def timer_added(self, timer: "TimerObj"):
+        pass
+
+    def timer_removed(self, timer: "TimerObj"):
+        pass
+
+    def entrant_changed(self, timer: "TimerObj", user_id: int, joined: bool):
+        pass
+
+    async def load(self) -> Optional[Dict[int, List[dict]]]:
+        """
+        The stored timers per guild, or None if they're stored in the guilds' config data."""
+        return None
+
+    async def flush(self, cache: Dict[int, Dict[int, "TimerObj"]]) -> int:
+        return 0
+
+    async def close(self, cache: Dict[int, Dict[int, "TimerObj"]]):
+        await self.flush(cache)
+
+    async def clear(self):
+        """Delete everything this storage has saved outside of Config."""
+
+
+class ConfigStorage(TimerStorage):
+    """
+    Write-behind persistence of timers to Config.
+
+    Instead of rewriting every guild's timers every so often, the cog marks a guild as dirty
+    whenever one of its timers is created, ended or has its entrants changed and only those
+    guilds are written on the next flush."""
+
+    def __init__(self, config: Config):
+        self.config = config
+        self._dirty: Set[int] = set()
+
+    @property
+    def dirty(self) -> Set[int]:
+        return self._dirty
+
+    def mark_dirty(self, guild_id: int):
+        self._dirty.add(guild_id)
+
+    def timer_added(self, timer: "TimerObj"):
+        self._dirty.add(timer.guild_id)
+
+    def timer_removed(self, timer: "TimerObj"):
+        self._dirty.add(timer.guild_id)
+
+    def entrant_changed(self, timer: "TimerObj", user_id: int, joined: bool):
+        self._dirty.add(timer.guild_id)
+
+    async def flush(self, cache: Dict[int, Dict[int, "TimerObj"]]) -> int:
+        """Write the timers of all dirty guilds to Config and return how many guilds were written."""
+        if not self._dirty:
+            return 0
+
+        # swap the set out first so anything that changes while we write gets picked up next time.
+        dirty, self._dirty = self._dirty, set()
+        guild_ids = list(dirty)
+        results = await asyncio.gather(
+            *(
+                self.config.guild_from_id(guild_id).timers.set(
+                    [timer.json for timer in cache.get(guild_id, {}).values()]
+                )
+                for guild_id in guild_ids
+            ),
+            return_exceptions=True,
+        )
+
+        written = 0
+        for guild_id, result in zip(guild_ids, results):
+            if isinstance(result, Exception):
+                log.error(f"Failed to save the timers of guild {guild_id}", exc_info=result)
+                self._dirty.add(guild_id)
+            else:
+                written += 1
+
+        return written
+
+
+class JournalStorage(TimerStorage):
+    """
+    Persists timers as an append-only journal of events in the cog's data folder.
+
+    Every flush appends only the events since the last one, so writing costs as much as
+    what changed rather than how many timers there are. Once the journal grows past
+    `compact_after` events it's compacted into a snapshot of all timers and truncated.
+    Loading reads the snapshot and replays the journal on top of it."""
+
+    def __init__(self, path: Path, compact_after: int = 10_000):
+        self.journal_path = path / "timers.journal"
+        self.snapshot_path = path / "timers.snapshot.json"
+        self.compact_after = compact_after
+        self._pending: List[Dict[str, Any]] = []
+        self._journaled = 0  # events written since the last snapshot
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def timer_added(self, timer: "TimerObj"):
+        self._pending.append({"op": "create", "timer": timer.json})
+
+    def timer_removed(self, timer: "TimerObj"):
+        self._pending.append(
+            {"op": "end", "guild_id": timer.guild_id, "message_id": timer.message_id}
+        )
+
+    def entrant_changed(self, timer: "TimerObj", user_id: int, joined: bool):
+        self._pending.append(
+            {
+                "op": "entrant",
+                "guild_id": timer.guild_id,
+                "message_id": timer.message_id,
+                "user_id": user_id,
+                "joined": joined,
+            }
+        )
+
+    def _read(self) -> Tuple[Dict[Tuple[int, int], dict], int, bool]:
+        timers: Dict[Tuple[int, int], dict] = {}
+        if self.snapshot_path.exists():
+            with self.snapshot_path.open() as fp:
+                for data in json.load(fp)["timers"]:
+                    timers[(data["guild_id"], data["message_id"])] = data
+
+        events, corrupt = 0, False
+        if self.journal_path.exists():
+            with self.journal_path.open() as fp:
+                for line in fp:
+                    try:
+                        event = json.loads(line)
+                    except json.JSONDecodeError:
+                        # the bot most likely died halfway through writing this line.
+                        log.warning("Skipping a corrupt line in the timer journal.")
+                        corrupt = True
+                        continue
+                    events += 1
+                    self._apply(timers, event)
+
+        return timers, events, corrupt
+
+    @staticmethod
+    def _apply(timers: Dict[Tuple[int, int], dict], event: Dict[str, Any]):
+        if event["op"] == "create":
+            data = event["timer"]
+            timers[(data["guild_id"], data["message_id"])] = data
+            return
+
+        if (data := timers.get((event["guild_id"], event["message_id"]))) is None:
+            return
+
+        if event["op"] == "end":
+            del timers[(event["guild_id"], event["message_id"])]
+
+        elif event["op"] == "entrant":
+            entrants = set(data.get("entrants") or [])
+            if event["joined"]:
+                entrants.add(event["user_id"])
+            else:
+                entrants.discard(event["user_id"])
+            data["entrants"] = list(entrants)
+
+    async def load(self) -> Dict[int, List[dict]]:
+        timers, self._journaled, corrupt = await asyncio.get_running_loop().run_in_executor(
+            None, self._read
+        )
+        if corrupt:
+            # anything appended after a half written line gets glued onto it, compact right away.
+            self._journaled = self.compact_after
+        guilds: Dict[int, List[dict]] = {}
+        for data in timers.values():
+            guilds.setdefault(data["guild_id"], []).append(data)
+        return guilds
+
+    def _append(self, events: List[Dict[str, Any]]):
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.journal_path.open("a") as fp:
+            fp.write("".join(json.dumps(event) + "\n" for event in events))
+            fp.flush()
+            os.fsync(fp.fileno())
+
+    def _write_snapshot(self, timers: List[dict]):
+        self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.snapshot_path.with_suffix(".tmp")
+        with tmp.open("w") as fp:
+            json.dump({"timers": timers}, fp)
+            fp.flush()
+            os.fsync(fp.fileno())
+        # only drop the journal once the snapshot that replaces it is safely in place.
+        os.replace(tmp, self.snapshot_path)
+        self.journal_path.unlink(missing_ok=True)
+
+    async def compact(self, cache: Dict[int, Dict[int, "TimerObj"]]):
+        """Write a snapshot of every timer and start a new, empty journal."""
+        # the cache already has every pending event applied to it.
+        self._pending.clear()
+        timers = [timer.json for guild in cache.values() for timer in guild.values()]
+        await asyncio.get_running_loop().run_in_executor(None, self._write_snapshot, timers)
+        self._journaled = 0
+
+    async def flush(self, cache: Dict[int, Dict[int, "TimerObj"]]) -> int:
+        """Append the pending events to the journal and return how many were written."""
+        if self._journaled + len(self._pending) >= self.compact_after:
+            written = len(self._pending)
+            try:
+                await self.compact(cache)
+            except Exception:
+                # the journal is still intact and the next flush tries again from the cache.
+                log.exception("Failed to compact the timer journal")
+                return 0
+            return written
+
+        if not self._pending:
+            return 0
+
+        events, self._pending = self._pending, []
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self._append, events)
+        except Exception:
+            log.exception("Failed to write to the timer journal")
+            self._pending[:0] = events
+            return 0
+
+        self._journaled += len(events)
+        return len(events)
+
+    async def close(self, cache: Dict[int, Dict[int, "TimerObj"]]):
+        await self.compact(cache)
+
+    async def clear(self):
+        """Delete the journal and the snapshot."""
+
+        def delete():
+            self.journal_path.unlink(missing_ok=True)
+            self.snapshot_path.unlink(missing_ok=True)
+
+        await asyncio.get_running_loop().run_in_executor(None, delete)
+        self._pending.clear()
+        self._journaled = 0
@@ -2,54 +2,45 @@ import asyncio
 import itertools
 import logging
 import math
-from typing import Any, Callable, Dict, Iterable, List, Optional, TypeVar
+import time
+from typing import Dict, List, Literal, Optional, Set, Tuple, Union
 
 import discord
 from discord.ext import tasks
 from redbot.core import Config, commands
 from redbot.core.bot import Red
+from redbot.core.data_manager import cog_data_path
 from redbot.core.utils import chat_formatting as cf
 
-from .models import TimerObj, TimerSettings, TimerView
+from .admission import AdmissionControl
+from .exceptions import TimerError
+from .models import TimerDigestView, TimerListSource, TimerObj, TimerSettings, TimerView
+from .notifier import Notifier
+from .paginator import Paginator
+from .pipeline import EndPipeline
+from .scheduler import DeadlineHandles, TimerHeap, TimingWheel
+from .stats import TimerStats, log_hook
+from .storage import ConfigStorage, JournalStorage, TimerStorage
 from .utils import EmojiConverter, TimeConverter
 
 guild_defaults = {
     "timers": [],
-    "timer_settings": {"notify_users": True, "emoji": "\U0001f389"},
+    "timer_settings": {
+        "notify_users": True,
+        "emoji": "\U0001f389",
+        "live_countdown": False,
+        "large_notify": "mentions",
+        "large_threshold": 1000,
+        "notify_role": None,
+        "coalesce_window": 0,
+    },
 }
 log = logging.getLogger("red.craycogs.Timer.timers")
 
-_T = TypeVar("_T")
-
-
-def all_min(
-    iterable: Iterable[_T],
-    key: Callable[[_T], Any] = lambda x: x,
-    *,
-    sortkey: Optional[Callable[[_T], Any]] = None,
-):
-    """A simple one liner function that returns all the least elements of an iterable instead of just one like the builtin `min()`.
-
-    !!!!!! SORT THE DATA PRIOR TO USING THIS FUNCTION !!!!!!
-    or pass the `sortkey` argument to this function which will be passed to the `sorted()` builtin to sort the iterable
-
-    A small explanation of what it does from bard:
-    - itertools.groupby() groups the elements in the iterable by their key value.
-    - map() applies the function lambda x: (x[0], list(x[1])) to each group.
-      This function returns a tuple containing the key of the group and a list of all of the elements in the group.
-    - min() returns the tuple with the minimum key value.
-    - [1] gets the second element of the tuple, which is the list of all of the minimum elements in the iterable.
-    """
-    if sortkey is not None:
-        iterable = sorted(iterable, key=sortkey)
-    try:
-        return min(
-            map(lambda x: (x[0], list(x[1])), itertools.groupby(iterable, key=key)),
-            key=lambda x: x[0],
-        )[1]
-
-    except ValueError:
-        return []
+# how many (emoji, disabled) pairs of prebuilt timer views are kept around.
+MAX_CACHED_VIEWS = 128
+# how many timers that ended while the bot was offline are ended per second after a restart.
+CATCH_UP_RATE = 5
 
 
 class Timer(commands.Cog):
@@ -62,20 +53,63 @@ class Timer(commands.Cog):
         self.bot = bot
         self.config = Config.get_conf(self, 1, True)
         self.config.register_guild(**guild_defaults)
-        self.config.register_global(max_duration=3600 * 12)  # a day long duration by default
-
-        self.cache: Dict[int, List[TimerObj]] = {}
+        self.config.register_global(
+            max_duration=3600 * 12,  # a day long duration by default
+            scheduler="loop",
+            flush_interval=60,
+            end_concurrency=5,
+            live_edit_budget=5,
+            stats_log=False,
+            storage="config",
+            # admission control, 0 means no limit.
+            max_timers=0,
+            guild_max_timers=0,
+            max_per_second=0,
+            guild_max_per_second=0,
+        )
 
-        self.task = self.end_timer.start()
-        self.to_end: List[TimerObj] = []
+        # guild_id -> message_id -> timer, so lookups don't have to walk the guild's timers.
+        self.cache: Dict[int, Dict[int, TimerObj]] = {}
+        # host id -> (guild_id, message_id) of the timers they started.
+        self._hosted: Dict[int, Set[Tuple[int, int]]] = {}
+        self._queue: Union[TimerHeap, TimingWheel] = TimerHeap()
+        # timers with a live countdown, keyed on when their embed should be edited next.
+        self._countdowns = TimerHeap()
+        self.live_edit_budget: int = 5
+        self._handles = DeadlineHandles(self._fire_timers)
+        self.admission = AdmissionControl()
+        self._end_tasks: Set[asyncio.Task] = set()
+        # (guild_id, message_id) of the timers that are being ended right now.
+        self._ending: Set[Tuple[int, int]] = set()
+        self._storage: TimerStorage = ConfigStorage(self.config)
+        self._pipeline = EndPipeline()
+        self._settings: Dict[int, TimerSettings] = {}
+        self.stats = TimerStats()
+        self._catch_up_task: Optional[asyncio.Task] = None
+        self.scheduler_mode: Literal["loop", "callat", "wheel"] = "loop"
+
+        self.task: Optional[asyncio.Task] = None
         self.view = TimerView(self)
+        self.digest_view = TimerDigestView(self)
+        self._views: Dict[Tuple[str, bool], TimerView] = {}
+        # join button clicks waiting to be applied, in the order they happened.
+        self._entrant_buffer: List[Tuple[int, int, int, bool]] = []
+        # (guild_id, message_id, user_id) -> whether the user will be an entrant once the buffer is applied.
+        self._pending_entrants: Dict[Tuple[int, int, int], bool] = {}
+        self.notifier = Notifier(self)
 
     async def red_delete_data_for_user(self, *, requester, user_id: int):
-        for timers in self.cache.values():
-            for timer in timers:
-                if timer._host == user_id:
-                    await timer.end()
-                    await self.remove_timer(timer)
+        # snapshot the user's timers, ending them changes the index.
+        timers = [
+            timer
+            for guild_id, message_id in list(self._hosted.get(user_id, ()))
+            if (timer := self.get_timer_nowait(guild_id, message_id)) is not None
+        ]
+        for timer in timers:
+            self._queue.discard(timer)
+        await self._end_timers(timers)
+        for timer in timers:
+            await self.remove_timer(timer)
 
     def format_help_for_context(self, ctx: commands.Context) -> str:
         pre_processed = super().format_help_for_context(ctx) or ""
@@ -88,73 +122,343 @@ class Timer(commands.Cog):
         return "\n".join(text)
 
     async def cog_load(self):
+        self.scheduler_mode = await self.config.scheduler()
+        if self.scheduler_mode == "wheel":
+            self._queue = TimingWheel()
+        self._pipeline.concurrency = await self.config.end_concurrency()
+        self.live_edit_budget = await self.config.live_edit_budget()
+        self.admission.max_timers = await self.config.max_timers()
+        self.admission.guild_max_timers = await self.config.guild_max_timers()
+        self.admission.max_per_second = await self.config.max_per_second()
+        self.admission.guild_max_per_second = await self.config.guild_max_per_second()
+        if await self.config.stats_log():
+            self.stats.hook = log_hook
+        self._storage = self._make_storage(await self.config.storage())
         guilds = await self.config.all_guilds()
+        if (journaled := await self._storage.load()) is not None:
+            # the journal is the source of truth, whatever config has for timers is stale.
+            for guild_id in journaled:
+                guilds.setdefault(
+                    guild_id, {"timer_settings": guild_defaults["timer_settings"].copy()}
+                )
+            for guild_id, guild_data in guilds.items():
+                guild_data["timers"] = journaled.get(guild_id, [])
+        overdue = self._load_timers(guilds)
+        if overdue:
+            self._catch_up_task = asyncio.create_task(self._catch_up(overdue))
 
-        for guild_data in guilds.values():
-            for x in guild_data.get("timers", []):
-                x.update({"bot": self.bot})
-                timer = TimerObj.from_json(x)
-                await self.add_timer(timer)
+        if self._queue:
+            self._wake_end_timer()
 
         self.max_duration: int = await self.config.max_duration()
+        self.flush_timers.change_interval(seconds=await self.config.flush_interval())
+        self.flush_timers.start()
         self.bot.add_view(self.view)
+        self.bot.add_view(self.digest_view)
         if self.bot.get_cog("Dev"):
             self.bot.add_dev_env_value("timer", lambda x: self)
 
-    async def get_timer(self, guild_id: int, timer_id: int):
+    def _load_timers(self, guilds: Dict[int, dict]) -> List[TimerObj]:
+        """
+        Build the cache and the queue from config data in a single pass.
+
+        Returns the timers that ended while the bot was offline, those are not queued."""
+        now = time.time()
+        pending: List[TimerObj] = []
+        overdue: List[TimerObj] = []
+
+        for guild_id, guild_data in guilds.items():
+            self._settings[guild_id] = TimerSettings(**guild_data["timer_settings"])
+            guild = self.cache.setdefault(guild_id, {})
+            for x in guild_data.get("timers", []):
+                x.update({"bot": self.bot})
+                try:
+                    timer = TimerObj.from_json(x)
+                except TimerError as e:
+                    log.warning(f"Skipping a malformed timer in guild {guild_id}: {e}")
+                    continue
+
+                if timer.message_id in guild:
+                    continue
+                guild[timer.message_id] = timer
+                self._hosted.setdefault(timer._host, set()).add((guild_id, timer.message_id))
+                self.admission.add(timer)
+                (overdue if timer.ends_at <= now else pending).append(timer)
+
+        self._queue.extend(pending)
+        for timer in pending:
+            if self.scheduler_mode == "callat":
+                self._handles.add(timer)
+            self._track_countdown(timer)
+
+        log.debug(f"Loaded {len(pending)} timers, {len(overdue)} ended while the bot was offline.")
+        return overdue
+
+    async def _catch_up(self, timers: List[TimerObj]):
+        await self.bot.wait_until_red_ready()
+        timers.sort(key=lambda x: x.ends_at)
+        for i in range(0, len(timers), CATCH_UP_RATE):
+            # skip timers ended meanwhile by `[p]timer end` or a data deletion request.
+            batch = [
+                timer
+                for timer in timers[i : i + CATCH_UP_RATE]
+                if self.get_timer_nowait(timer.guild_id, timer.message_id) is timer
+            ]
+            if not batch:
+                continue
+            started = time.monotonic()
+            await self._end_timers(batch)
+            await asyncio.sleep(max(1 - (time.monotonic() - started), 0))
+
+    def get_timer_nowait(self, guild_id: int, timer_id: int) -> Optional[TimerObj]:
         if not (guild := self.cache.get(guild_id)):
             return None
 
-        for timer in guild:
-            if timer.message_id == timer_id:
-                return timer
+        return guild.get(timer_id)
+
+    async def get_timer(self, guild_id: int, timer_id: int) -> Optional[TimerObj]:
+        return self.get_timer_nowait(guild_id, timer_id)
+
+    def mark_ending(self, timer: TimerObj) -> bool:
+        """
+        Claim a timer to end it.
+
+        Returns False if it's already being ended or was ended already, the caller must leave it be.
+        Otherwise `unmark_ending` must be called once the caller is done with it."""
+        key = (timer.guild_id, timer.message_id)
+        if key in self._ending or self.get_timer_nowait(*key) is not timer:
+            return False
+        self._ending.add(key)
+        return True
+
+    def unmark_ending(self, timer: TimerObj):
+        self._ending.discard((timer.guild_id, timer.message_id))
+
+    def toggle_entrant(self, timer: TimerObj, user_id: int) -> bool:
+        """
+        Toggle whether a user is waiting on a timer.
+
+        The change is only buffered, see `apply_entrant_buffer`.
+        Returns whether the user is now an entrant. The host can never be one."""
+        if user_id == timer._host:
+            return False
+
+        key = (timer.guild_id, timer.message_id, user_id)
+        joined = not self._pending_entrants.get(key, user_id in timer._entrants)
+        self._pending_entrants[key] = joined
+        self._entrant_buffer.append((*key, joined))
+        return joined
+
+    def apply_entrant_buffer(self):
+        """Apply every buffered join button click to its timer and mark the guilds to be saved."""
+        if not self._entrant_buffer:
+            return
+
+        buffer, self._entrant_buffer = self._entrant_buffer, []
+        self._pending_entrants.clear()
+        for guild_id, message_id, user_id, joined in buffer:
+            if (timer := self.get_timer_nowait(guild_id, message_id)) is None:
+                continue
+            if joined == (user_id in timer._entrants):
+                continue
+            if joined:
+                timer._entrants.add(user_id)
+            else:
+                timer._entrants.discard(user_id)
+            self._storage.entrant_changed(timer, user_id, joined)
 
     async def add_timer(self, timer: TimerObj):
-        if await self.get_timer(timer.guild_id, timer.message_id):
+        guild = self.cache.setdefault(timer.guild_id, {})
+        if timer.message_id in guild:
             return
-        self.cache.setdefault(timer.guild_id, []).append(timer)
+        guild[timer.message_id] = timer
+        self._hosted.setdefault(timer._host, set()).add((timer.guild_id, timer.message_id))
+        self.admission.add(timer)
+        self._storage.timer_added(timer)
+        self._queue.push(timer)
+        if self.scheduler_mode == "callat":
+            self._handles.add(timer)
+        self._track_countdown(timer)
 
     async def remove_timer(self, timer: TimerObj):
-        if not (guild := self.cache.get(timer.guild_id)):
+        self._queue.discard(timer)
+        self._handles.discard(timer)
+        self._countdowns.discard(timer)
+        if (
+            not (guild := self.cache.get(timer.guild_id))
+            or guild.get(timer.message_id) is not timer
+        ):
             return
-        self.cache[timer.guild_id].remove(timer)
-
-    async def get_guild_settings(self, guild_id: int):
-        return TimerSettings(**await self.config.guild_from_id(guild_id).timer_settings())
-
-    async def _back_to_config(self):
-        for guild_id, timers in self.cache.items():
-            await self.config.guild_from_id(guild_id).timers.set([x.json for x in timers])
+        del guild[timer.message_id]
+        if hosted := self._hosted.get(timer._host):
+            hosted.discard((timer.guild_id, timer.message_id))
+            if not hosted:
+                del self._hosted[timer._host]
+        self.admission.discard(timer)
+        self._storage.timer_removed(timer)
+
+    def get_guild_settings(self, guild_id: int) -> TimerSettings:
+        # filled in cog_load and kept up to date by the timerset commands so this never hits config.
+        if (settings := self._settings.get(guild_id)) is None:
+            settings = self._settings[guild_id] = TimerSettings(**guild_defaults["timer_settings"])
+        return settings
+
+    def get_view(self, emoji: str, disabled: bool = False) -> TimerView:
+        """
+        Get a prebuilt view to send with a timer message.
+
+        These are stopped so discord.py never stores them for the message they're sent with,
+        they only provide the components. Clicks are handled by the persistent `self.view`."""
+        key = (emoji, disabled)
+        if (view := self._views.get(key)) is None:
+            if len(self._views) >= MAX_CACHED_VIEWS:
+                del self._views[next(iter(self._views))]
+            view = self._views[key] = TimerView(self, emoji, disabled)
+            view.stop()
+        return view
+
+    def _make_storage(self, mode: Literal["config", "journal"]) -> TimerStorage:
+        if mode == "journal":
+            return JournalStorage(cog_data_path(self))
+        return ConfigStorage(self.config)
 
     async def cog_unload(self):
-        self.task.cancel()
+        self.end_timer.cancel()
+        self.flush_timers.cancel()
+        self.update_countdowns.cancel()
+        if self._catch_up_task:
+            self._catch_up_task.cancel()
+        self._handles.clear()
+        for task in self._end_tasks:
+            task.cancel()
+        self._pipeline.close()
         self.view.stop()
+        self.digest_view.stop()
         self.bot.remove_dev_env_value("timer")
-        await self._back_to_config()
+        self.apply_entrant_buffer()
+        await self._storage.close(self.cache)
+
+    def _wake_end_timer(self, deadline: Optional[float] = None):
+        if self.scheduler_mode == "callat":
+            # the timer's own handle takes care of it.
+            return
+
+        if (
+            deadline is not None
+            and self.end_timer.is_running()
+            and (next_iteration := self.end_timer.next_iteration) is not None
+            and deadline >= next_iteration.timestamp()
+        ):
+            # the loop is going to wake up before this timer is due anyway.
+            return
+
+        # (re)start the loop so that it recalculates its interval from the top of the queue.
+        if self.end_timer.is_running():
+            self.end_timer.restart()
+        else:
+            self.end_timer.start()
+        self.task = self.end_timer.get_task()
+
+    async def _end_timers(self, timers: List[TimerObj]):
+        if not timers:
+            return
+        # guilds and channels aren't available until the bot is ready.
+        await self.bot.wait_until_red_ready()
+        with self.stats.measure("tick", timers=len(timers)):
+            results = await asyncio.gather(
+                *[self._pipeline.submit(timer) for timer in timers], return_exceptions=True
+            )
+
+        for timer, result in zip(timers, results):
+            if isinstance(result, Exception):
+                log.error(f"A timer ended with an error:", exc_info=result)
+                # it's already off the queue, don't leave it lingering in the cache.
+                await self.remove_timer(timer)
+
+    def _dispatch_timers(self, timers: List[TimerObj]):
+        """
+        Hand due timers to the end pipeline without waiting for them to be ended.
+
+        The schedulers must never wait on the pipeline, a slow channel or a guild's
+        coalescing window would hold up every timer due after it."""
+        if not timers:
+            return
+        task = asyncio.create_task(self._end_timers(timers))
+        self._end_tasks.add(task)
+        task.add_done_callback(self._end_tasks.discard)
+
+    def _fire_timers(self, timers: List[TimerObj]):
+        # called by the event loop through `DeadlineHandles` when running in `callat` mode.
+        for timer in timers:
+            self._queue.discard(timer)
+        self._dispatch_timers(timers)
+
+    def _set_scheduler_mode(self, mode: Literal["loop", "callat", "wheel"]):
+        self.scheduler_mode = mode
+        queue_cls = TimingWheel if mode == "wheel" else TimerHeap
+        if not isinstance(self._queue, queue_cls):
+            queue, self._queue = self._queue, queue_cls()
+            self._queue.extend(list(queue))
+
+        if mode == "callat":
+            self.end_timer.cancel()
+            for timer in self._queue:
+                self._handles.add(timer)
+        else:
+            self._handles.clear()
+            if self._queue:
+                self._wake_end_timer()
+
+    @tasks.loop(seconds=60)
+    async def flush_timers(self):
+        self.apply_entrant_buffer()
+        if written := await self._storage.flush(self.cache):
+            log.debug(f"Saved {written} timer changes.")
+
+    def _track_countdown(self, timer: TimerObj):
+        if not self.get_guild_settings(timer.guild_id).live_countdown:
+            return
+        self._countdowns.push(timer, time.time() + timer.edit_wait_duration)
+        if not self.update_countdowns.is_running():
+            self.update_countdowns.start()
 
     @tasks.loop(seconds=1)
-    async def end_timer(self):
-        if self.end_timer._current_loop and self.end_timer._current_loop % 100 == 0:
-            await self._back_to_config()
+    async def update_countdowns(self):
+        # a single loop edits every live countdown so the edits can be spread out under one budget.
+        # timers that didn't fit in this second's budget just stay due and go first next second.
+        if not self._countdowns:
+            return self.update_countdowns.stop()
 
+        timers = self._countdowns.pop_due(time.time(), self.live_edit_budget)
         results = await asyncio.gather(
-            *[timer.end() for timer in self.to_end], return_exceptions=True
+            *[timer.update_countdown() for timer in timers], return_exceptions=True
         )
 
-        for result in results:
+        for timer, result in zip(timers, results):
             if isinstance(result, Exception):
-                log.error(f"A timer ended with an error:", exc_info=result)
+                log.debug(f"Failed to update the countdown of {timer!r}", exc_info=result)
+            wait = timer.edit_wait_duration
+            # no point editing it again if it ends before the next edit.
+            if (
+                self.get_guild_settings(timer.guild_id).live_countdown
+                and timer in self._queue
+                and timer.remaining_time > wait
+            ):
+                self._countdowns.push(timer, time.time() + wait)
+
+    @update_countdowns.before_loop
+    async def before_update_countdowns(self):
+        await self.bot.wait_until_red_ready()
 
-        self.to_end = all_min(
-            itertools.chain.from_iterable(self.cache.values()),
-            key=lambda x: math.ceil(x.remaining_time),
-            sortkey=lambda x: math.ceil(x.remaining_time),
-        )
-        if not self.to_end:
+    @tasks.loop(seconds=1)
+    async def end_timer(self):
+        self._dispatch_timers(self._queue.pop_due(time.time()))
+
+        if (deadline := self._queue.next_deadline()) is None:
             log.debug("No timers to end, stopping task.")
             return self.end_timer.stop()
 
-        interval = max(math.ceil(getattr(next(iter(self.to_end), None), "remaining_time", 1)), 1)
+        interval = max(math.ceil(deadline - time.time()), 1)
         self.end_timer.change_interval(seconds=interval)
         log.debug(f"Changed interval to {interval} seconds")
 
@@ -174,11 +478,15 @@ class Timer(commands.Cog):
 
         `time`: The duration to start the timer. The duration uses basic time units
                 `s` (seconds), `m` (minutes), `h` (hours), `d` (days), `w` (weeks)
+                like `1h30m`, or an ISO-8601 duration like `PT1H30M`.
                 The maximum duration is 12 hours. change that with `timerset maxduration`.
 
         `name`: The name of the timer.
         """
 
+        if reason := self.admission.check(ctx.guild.id, time.timestamp()):
+            return await ctx.send(reason)
+
         timer = TimerObj(
             **{
                 "message_id": None,
@@ -186,7 +494,7 @@ class Timer(commands.Cog):
                 "guild_id": ctx.guild.id,
                 "bot": ctx.bot,
                 "name": name,
-                "emoji": (await self.get_guild_settings(ctx.guild.id)).emoji,
+                "emoji": self.get_guild_settings(ctx.guild.id).emoji,
                 "host": ctx.author.id,
                 "ends_at": time,
             }
@@ -195,12 +503,7 @@ class Timer(commands.Cog):
         await timer.start()
         await ctx.tick(message="Timer for `{}` started!".format(name))
 
-        self.to_end.clear()
-        if self.end_timer.is_running():
-            self.end_timer.restart()
-        else:
-            self.end_timer.start()
-        self.task = self.end_timer.get_task()
+        self._wake_end_timer(timer.ends_at)
 
     @timer.command(name="end")
     async def timer_end(self, ctx: commands.Context, timer_id: int):
@@ -216,37 +519,54 @@ class Timer(commands.Cog):
             await ctx.send("Timer not found.")
             return
 
-        await timer.end()
+        # end it through the pipeline like any other timer so it keeps its channel's order.
+        self._queue.discard(timer)
+        self._handles.discard(timer)
+        try:
+            await self._pipeline.submit(timer)
+        except Exception:
+            log.exception(f"Failed to end {timer!r}")
+            await self.remove_timer(timer)
+            return await ctx.send("Something went wrong while ending that timer, it was removed.")
         await ctx.tick(message="Timer ended!")
 
-        self.to_end.clear()
-        if self.end_timer.is_running():
-            self.end_timer.restart()
-        else:
-            self.end_timer.start()
-        self.task = self.end_timer.get_task()
-
     @timer.command(name="list")
     @commands.bot_has_permissions(embed_links=True)
-    async def timer_list(self, ctx: commands.Context):
+    async def timer_list(
+        self,
+        ctx: commands.Context,
+        *,
+        host_or_channel: Optional[
+            Union[discord.Member, discord.TextChannel, discord.Thread]
+        ] = None,
+    ):
+        """
+        Get a list of all the active timers in this server.
+
+        `host_or_channel`: Only show the timers started by this member or in this channel.
         """
-        Get a list of all the active timers in this server."""
-        if not self.cache.get(ctx.guild.id):
+        timers = self.cache.get(ctx.guild.id, {}).values()
+        if isinstance(host_or_channel, discord.Member):
+            timers = [x for x in timers if x._host == host_or_channel.id]
+        elif host_or_channel is not None:
+            timers = [x for x in timers if x.channel_id == host_or_channel.id]
+
+        if not timers:
             await ctx.send("No timers found.")
             return
 
-        embed = discord.Embed(
-            title="Timers in **{}**".format(ctx.guild.name),
-            description="\n".join(
-                "{} - {}".format(
-                    f"[{x.name}]({x.jump_url})",
-                    cf.humanize_timedelta(timedelta=x.remaining_seconds),
-                )
-                for x in self.cache[ctx.guild.id]
+        # overdue timers waiting on catch-up and timers being ended aren't queued anymore,
+        # they end before anything that still is.
+        ending = sorted((x for x in timers if x not in self._queue), key=lambda x: x.ends_at)
+        await Paginator(
+            TimerListSource(
+                "Timers in **{}**".format(ctx.guild.name),
+                # the scheduler already knows the order, no need to sort every timer of the guild.
+                itertools.chain(ending, self._queue.ordered(timers)),
+                len(timers),
             ),
-            color=await ctx.embed_color(),
-        )
-        await ctx.send(embed=embed)
+            start_index=0,
+        ).start(ctx)
 
     @commands.group(name="timerset", aliases=["tset", "timersettings"])
     @commands.bot_has_permissions(embed_links=True)
@@ -264,6 +584,7 @@ class Timer(commands.Cog):
         """
 
         await self.config.guild_from_id(ctx.guild.id).timer_settings.emoji.set(emoji)
+        self.get_guild_settings(ctx.guild.id).emoji = emoji
         await ctx.tick()
 
     @tset.command(name="maxduration", aliases=["duration", "md"])
@@ -276,6 +597,333 @@ class Timer(commands.Cog):
         """
 
         await self.config.max_duration.set(duration.total_seconds())
+        self.max_duration = duration.total_seconds()
+        await ctx.tick()
+
+    @tset.command(name="scheduler")
+    @commands.is_owner()
+    async def tset_scheduler(
+        self, ctx: commands.Context, mode: Literal["loop", "callat", "wheel"]
+    ):
+        """
+        Change how timers are scheduled to end.
+
+        `mode`: One of `loop`, `callat` or `wheel`.
+                `loop` uses a single background loop that sleeps until the next timer is due.
+                `callat` schedules every second that has timers ending in it directly on the event loop,
+                which fires them on the exact second and doesn't restart anything when a timer is started.
+                `wheel` keeps timers in a timing wheel of seconds, minutes and hours driven by the same loop.
+                Use it if you have millions of timers, starting and ending them early stays constant time.
+        """
+
+        await self.config.scheduler.set(mode)
+        self._set_scheduler_mode(mode)
+        await ctx.tick()
+
+    @tset.command(name="flushinterval", aliases=["saveinterval"])
+    @commands.is_owner()
+    async def tset_flushinterval(self, ctx: commands.Context, interval: TimeConverter(True)):
+        """
+        Change how often changed timers are saved.
+
+        Only the servers whose timers were created, ended or joined since the last save are written.
+        Anything changed after the last save is lost if the bot crashes.
+
+        `interval`: The interval between saves.
+        """
+
+        seconds = interval.total_seconds()
+        await self.config.flush_interval.set(seconds)
+        self.flush_timers.change_interval(seconds=seconds)
+        await ctx.tick()
+
+    @tset.command(name="storage")
+    @commands.is_owner()
+    async def tset_storage(self, ctx: commands.Context, backend: Literal["config", "journal"]):
+        """
+        Change where timers are saved.
+
+        `backend`: One of `config` or `journal`.
+                `config` saves every timer of a server to the bot's config whenever one of them changes.
+                `journal` appends only what changed (timers started, ended or joined) to a file in the cog's data folder
+                and compacts it into a snapshot every so often. Use it if you have a lot of timers.
+        Existing timers are moved over to the new backend.
+        """
+
+        if backend == await self.config.storage():
+            return await ctx.send(f"Timers are already saved with `{backend}`.")
+
+        self.apply_entrant_buffer()
+        old, new = self._storage, self._make_storage(backend)
+        if isinstance(new, JournalStorage):
+            await new.compact(self.cache)
+            # config's copy of the timers won't be kept up to date anymore.
+            for guild_id in await self.config.all_guilds():
+                await self.config.guild_from_id(guild_id).timers.clear()
+        else:
+            for guild_id in self.cache:
+                new.mark_dirty(guild_id)
+            await new.flush(self.cache)
+            await old.clear()
+
+        self._storage = new
+        await self.config.storage.set(backend)
+        await ctx.tick()
+
+    @tset.command(name="concurrency")
+    @commands.is_owner()
+    async def tset_concurrency(self, ctx: commands.Context, amount: commands.Range[int, 1, 50]):
+        """
+        Change how many timers can be ending at the same time.
+
+        Timers in the same channel always end one after another,
+        this caps how many channels are worked on at once.
+
+        `amount`: The number of timers. (1-50)
+        """
+
+        await self.config.end_concurrency.set(amount)
+        self._pipeline.concurrency = amount
+        await ctx.tick()
+
+    @tset.group(name="stats", invoke_without_command=True)
+    @commands.is_owner()
+    async def tset_stats(self, ctx: commands.Context):
+        """
+        See how late timers end and how long ending them takes.
+
+        Everything is over the last 1000 samples.
+        `drift` is how long after its end time a timer was actually ended.
+        `tick` is a whole batch of due timers, `end` is a single timer
+        and `edit`, `reply` and `pings` are the parts of ending one.
+        """
+
+        def fmt(name: str, summary: dict):
+            if not summary["count"]:
+                return f"**{name}**: No samples yet."
+            return f"**{name}** ({summary['count']} samples): " + " | ".join(
+                f"{key} `{summary[key] * 1000:.0f}ms`"
+                for key in ("mean", "p50", "p90", "p99", "max")
+            )
+
+        lines = [fmt("drift", self.stats.drift.summary())] + [
+            fmt(stage, histogram.summary()) for stage, histogram in self.stats.stages.items()
+        ]
+        embed = discord.Embed(
+            title="Timer stats",
+            description="\n".join(lines),
+            color=await ctx.embed_color(),
+        ).set_footer(text=f"Structured logging: {'on' if self.stats.hook else 'off'}")
+        await ctx.send(embed=embed)
+
+    @tset_stats.command(name="log")
+    async def tset_stats_log(self, ctx: commands.Context, enabled: bool):
+        """
+        Toggle logging every stats sample as a json line to the `red.craycogs.Timer.stats` logger.
+
+        `enabled`: Whether or not to log the samples. (`True`/`False`)
+        """
+
+        await self.config.stats_log.set(enabled)
+        self.stats.hook = log_hook if enabled else None
+        await ctx.tick()
+
+    @tset_stats.command(name="reset", aliases=["clear"])
+    async def tset_stats_reset(self, ctx: commands.Context):
+        """
+        Clear all collected stats."""
+        self.stats.clear()
+        await ctx.tick()
+
+    @tset.command(name="queue")
+    @commands.is_owner()
+    async def tset_queue(self, ctx: commands.Context):
+        """
+        See how many timers are waiting to be ended and how long it's taking to end them."""
+        latency = self._pipeline.drain_latency
+        last = self._pipeline.last_drain_latency
+        embed = discord.Embed(
+            title="Timer end queue",
+            description=f"Queued timers: `{self._pipeline.depth}`\n"
+            f"Channels being worked on: `{self._pipeline.busy_channels}`\n"
+            f"Concurrency: `{self._pipeline.concurrency}`\n"
+            f"Average drain latency: `{f'{latency:.2f}s' if latency is not None else 'N/A'}`\n"
+            f"Last drain latency: `{f'{last:.2f}s' if last is not None else 'N/A'}`",
+            color=await ctx.embed_color(),
+        )
+        await ctx.send(embed=embed)
+
+    @tset.group(name="limits", aliases=["limit"], invoke_without_command=True)
+    @commands.is_owner()
+    async def tset_limits(self, ctx: commands.Context):
+        """
+        See and change how many timers can be running and ending at the same time.
+
+        A limit of 0 means there is no limit.
+        """
+
+        def fmt(name: str, usage: Tuple[int, int]):
+            current, cap = usage
+            return f"{name}: `{current}`/`{cap or 'no limit'}`"
+
+        usage = self.admission.usage(ctx.guild.id)
+        embed = discord.Embed(
+            title="Timer limits",
+            description="\n".join(
+                [
+                    fmt("Running timers in this server", usage["guild_active"]),
+                    fmt("Running timers in total", usage["active"]),
+                    fmt(
+                        "Timers in this server ending in the same second",
+                        usage["guild_per_second"],
+                    ),
+                    fmt("Timers ending in the same second", usage["per_second"]),
+                ]
+            ),
+            color=await ctx.embed_color(),
+        ).set_footer(text="The per second usage is that of the busiest second.")
+        await ctx.send(embed=embed)
+
+    @tset_limits.command(name="guild", aliases=["server"])
+    async def tset_limits_guild(self, ctx: commands.Context, timers: commands.Range[int, 0]):
+        """
+        Change how many timers can be running in a single server.
+
+        `timers`: The number of timers, 0 for no limit.
+        """
+
+        await self.config.guild_max_timers.set(timers)
+        self.admission.guild_max_timers = timers
+        await ctx.tick()
+
+    @tset_limits.command(name="total", aliases=["global"])
+    async def tset_limits_total(self, ctx: commands.Context, timers: commands.Range[int, 0]):
+        """
+        Change how many timers can be running across all servers.
+
+        `timers`: The number of timers, 0 for no limit.
+        """
+
+        await self.config.max_timers.set(timers)
+        self.admission.max_timers = timers
+        await ctx.tick()
+
+    @tset_limits.command(name="guildpersecond", aliases=["serverpersecond"])
+    async def tset_limits_guildpersecond(
+        self, ctx: commands.Context, timers: commands.Range[int, 0]
+    ):
+        """
+        Change how many timers of a single server can end in the same second.
+
+        `timers`: The number of timers, 0 for no limit.
+        """
+
+        await self.config.guild_max_per_second.set(timers)
+        self.admission.guild_max_per_second = timers
+        await ctx.tick()
+
+    @tset_limits.command(name="persecond")
+    async def tset_limits_persecond(self, ctx: commands.Context, timers: commands.Range[int, 0]):
+        """
+        Change how many timers across all servers can end in the same second.
+
+        `timers`: The number of timers, 0 for no limit.
+        """
+
+        await self.config.max_per_second.set(timers)
+        self.admission.max_per_second = timers
+        await ctx.tick()
+
+    @tset.command(name="livecountdown", aliases=["live"])
+    async def tset_livecountdown(self, ctx: commands.Context, live: bool):
+        """
+        Toggle whether timer embeds show a regularly updated countdown.
+
+        The countdown is edited more often as the timer nears its end.
+
+        `live`: Whether or not to show the countdown. (`True`/`False`)
+        """
+
+        await self.config.guild_from_id(ctx.guild.id).timer_settings.live_countdown.set(live)
+        self.get_guild_settings(ctx.guild.id).live_countdown = live
+        for timer in self.cache.get(ctx.guild.id, {}).values():
+            if live:
+                self._track_countdown(timer)
+            elif timer in self._queue:
+                # one last edit, under the same budget, to take the stale countdown out of the embed.
+                self._countdowns.push(timer, time.time())
+        if not live and self._countdowns and not self.update_countdowns.is_running():
+            self.update_countdowns.start()
+        await ctx.tick()
+
+    @tset.command(name="editbudget")
+    @commands.is_owner()
+    async def tset_editbudget(self, ctx: commands.Context, edits: commands.Range[int, 1, 50]):
+        """
+        Change how many live countdown embeds can be edited per second across all servers.
+
+        `edits`: The number of edits per second. (1-50)
+        """
+
+        await self.config.live_edit_budget.set(edits)
+        self.live_edit_budget = edits
+        await ctx.tick()
+
+    @tset.command(name="largenotify", aliases=["largeping"])
+    async def tset_largenotify(
+        self,
+        ctx: commands.Context,
+        mode: Literal["mentions", "role", "digest"],
+        role: Optional[discord.Role] = None,
+    ):
+        """
+        Change how users are notified when a timer with a lot of users waiting on it ends.
+
+        `mode`: One of `mentions`, `role` or `digest`.
+                `mentions` mentions every user like for any other timer.
+                `role` pings the given role once instead.
+                `digest` sends a single message with a button that tells users whether they were waiting for it.
+        `role`: The role to ping. Required for the `role` mode.
+
+        See `[p]timerset largethreshold` to change how many users count as a lot.
+        """
+
+        if mode == "role" and role is None:
+            return await ctx.send("You need to pass a role to ping for the `role` mode.")
+
+        settings = self.get_guild_settings(ctx.guild.id)
+        async with self.config.guild_from_id(ctx.guild.id).timer_settings() as data:
+            data["large_notify"] = settings.large_notify = mode
+            if role is not None:
+                data["notify_role"] = settings.notify_role = role.id
+        await ctx.tick()
+
+    @tset.command(name="largethreshold")
+    async def tset_largethreshold(self, ctx: commands.Context, users: commands.Range[int, 1]):
+        """
+        Change how many users need to be waiting on a timer for `[p]timerset largenotify` to apply.
+
+        `users`: The number of users.
+        """
+
+        await self.config.guild_from_id(ctx.guild.id).timer_settings.large_threshold.set(users)
+        self.get_guild_settings(ctx.guild.id).large_threshold = users
+        await ctx.tick()
+
+    @tset.command(name="coalesce", aliases=["batch"])
+    async def tset_coalesce(self, ctx: commands.Context, seconds: commands.Range[int, 0, 30]):
+        """
+        Announce timers in the same channel that end close together in one message.
+
+        Once a timer ends, the bot waits up to this many seconds for other timers in the channel
+        to end and then sends a single reply for all of them, pinging all of their users at once.
+        Timer announcements are delayed by up to this long.
+
+        `seconds`: The window in seconds, 0 to announce every timer on its own. (0-30)
+        """
+
+        await self.config.guild_from_id(ctx.guild.id).timer_settings.coalesce_window.set(seconds)
+        self.get_guild_settings(ctx.guild.id).coalesce_window = seconds
         await ctx.tick()
 
     @tset.command(name="notifyusers", aliases=["notify"])
@@ -287,19 +935,25 @@ class Timer(commands.Cog):
         """
 
         await self.config.guild_from_id(ctx.guild.id).timer_settings.notify_users.set(notify)
+        self.get_guild_settings(ctx.guild.id).notify_users = notify
         await ctx.tick()
 
     @tset.command(name="showsettings", aliases=["ss", "showsetting", "show"])
     async def tset_showsettings(self, ctx: commands.Context):
         """
         See the configured settings for timers in your server."""
-        settings = await self.get_guild_settings(ctx.guild.id)
+        settings = self.get_guild_settings(ctx.guild.id)
         embed = discord.Embed(
             title=f"Timer Settings for **{ctx.guild.name}**",
             description=f"Emoji: `{settings.emoji}`\n"
-            f"Notify users: `{settings.notify_users}`"
+            f"Notify users: `{settings.notify_users}`\n"
+            f"Live countdown: `{settings.live_countdown}`\n"
+            f"Coalescing window: `{settings.coalesce_window}s`\n"
+            f"Running timers: `{self.admission.guild_active(ctx.guild.id)}`/`{self.admission.guild_max_timers or 'no limit'}`\n"
+            f"Timers with more than `{settings.large_threshold}` users waiting notify with: `{settings.large_notify}`"
+            + (f" (<@&{settings.notify_role}>)" if settings.large_notify == "role" else "")
             + (
-                f"\nMax duration: `{cf.humanize_timedelta(seconds=await self.config.max_duration())}`"
+                f"\nMax duration: `{cf.humanize_timedelta(seconds=self.max_duration)}`"
                 if await ctx.bot.is_owner(ctx.author)
                 else ""
             ),
@@ -1,15 +1,49 @@
-import re
+import functools
 from datetime import datetime, timedelta, timezone
+from typing import Iterable, List
 
 import emoji
 from redbot.core import commands
 from redbot.core.utils.chat_formatting import humanize_timedelta
 
+UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 86400 * 7}
+# the date part of an ISO-8601 duration, the time part (after the `T`) uses `UNITS`.
+ISO_DATE_UNITS = {"w": 86400 * 7, "d": 86400}
+INVALID_FORMAT = "Invalid time format. s|m|h|d|w are valid units, like `1h30m` or `PT1H30M`."
+
+
+@functools.lru_cache(maxsize=256)
+def parse_duration(argument: str) -> float:
+    """
+    Parse a duration like `1h30m`, `2d 12h` or an ISO-8601 duration like `PT1H30M` into seconds.
+
+    This is a single pass over the string, recently parsed strings are cached."""
+    text = argument.lower().replace(" ", "")
+    iso = text.startswith("p")
+    units = ISO_DATE_UNITS if iso else UNITS
+    total, number, parsed = 0.0, "", False
+    for char in text[1:] if iso else text:
+        if char.isdigit() or char == ".":
+            number += char
+        elif iso and char == "t" and not number and units is ISO_DATE_UNITS:
+            units = UNITS
+        elif char in units and number:
+            try:
+                total += float(number) * units[char]
+            except ValueError:
+                raise commands.BadArgument(f"{number} is not a number!")
+            number, parsed = "", True
+        elif iso and char in "ym":
+            raise commands.BadArgument("Years and months aren't supported, use weeks or days.")
+        else:
+            raise commands.BadArgument(INVALID_FORMAT)
+
+    if number or not parsed:
+        raise commands.BadArgument(INVALID_FORMAT)
+    return total
 
-class TimeConverter(commands.Converter):
-    time_regex = re.compile(r"(?:(\d{1,5})(h|s|m|d|w))+?")
-    time_dict = {"h": 3600, "s": 1, "m": 60, "d": 86400, "w": 86400 * 7}
 
+class TimeConverter(commands.Converter):
     def __init__(self, setting: bool = False):
         self.setting = setting
 
@@ -17,32 +51,16 @@ class TimeConverter(commands.Converter):
         return self
 
     async def convert(self, ctx: commands.Context, argument: str):
-        args = argument.lower()
-        matches = re.findall(self.time_regex, args)
-        time = 0
-        if not matches:
-            raise commands.BadArgument("Invalid time format. h|m|s|d are valid arguments.")
-        for key, value in matches:
-            try:
-                time += self.time_dict[value] * float(key)
-            except KeyError:
-                raise commands.BadArgument(
-                    f"{value} is an invalid time key! h|m|s|d are valid arguments"
-                )
-            except ValueError:
-                raise commands.BadArgument(f"{key} is not a number!")
+        time = parse_duration(argument)
 
         if not time >= 10:
             raise commands.BadArgument("Time must be greater than 10 seconds.")
 
-        if not self.setting and time > (seconds := await ctx.cog.config.max_duration()):
-            suggestion = (
-                f"You can change this with `{ctx.prefix}timerset maxduration`."
-                if await ctx.bot.is_owner(ctx.author)
-                else ""
-            )
+        # kept up to date by `timerset maxduration` so this doesn't hit config.
+        if not self.setting and time > (seconds := ctx.cog.max_duration):
             raise commands.BadArgument(
-                f"Time for timers must be less than {humanize_timedelta(seconds=seconds)}. {suggestion}"
+                f"Time for timers must be less than {humanize_timedelta(seconds=seconds)}. "
+                f"The bot owner can change this with `{ctx.prefix}timerset maxduration`."
             )
 
         timed = timedelta(seconds=time)
@@ -60,3 +78,26 @@ class EmojiConverter(commands.EmojiConverter):
 
         else:
             return argument
+
+
+def chunk_mentions(user_ids: Iterable[int], page_length: int = 2000) -> List[str]:
+    """
+    Split raw user mentions into messages of at most `page_length` characters.
+
+    The mentions are built straight from the ids so there are no member lookups
+    and no `pagify` scanning for delimiters."""
+    pages: List[str] = []
+    current: List[str] = []
+    length = 0
+    for user_id in user_ids:
+        mention = f"<@{user_id}>"
+        # +1 for the space joining it to the previous mention
+        if current and length + len(mention) + 1 > page_length:
+            pages.append(" ".join(current))
+            current, length = [], 0
+        length += len(mention) + (1 if current else 0)
+        current.append(mention)
+
+    if current:
+        pages.append(" ".join(current))
+    return pages